@@ -1,12 +1,213 @@
 """Base operations for TextEditor."""
 
+import array
+import asyncio
+import codecs
+import functools
 import hashlib
+import io
+import itertools
 import logging
 import os
-from typing import Optional, Tuple
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Callable, List, Literal, Optional, Tuple, overload
 
 logger = logging.getLogger(__name__)
 
+# Read size used when hashing files in binary chunks
+HASH_CHUNK_SIZE = 1 << 18
+
+# Read size used when appending one file to another
+COPY_CHUNK_SIZE = 1 << 20
+
+# Batch append sources up to this size are read concurrently ahead of
+# appending; larger ones are streamed when their turn comes
+PREFETCH_MAX_SIZE = 1 << 20
+
+# At most this many batch append sources, totalling at most PREFETCH_MAX_BYTES,
+# are read ahead of the one being appended
+PREFETCH_CONCURRENCY = 8
+PREFETCH_MAX_BYTES = 16 << 20
+
+# Unchanged file prefixes at least this large are copied with os.sendfile
+PREFIX_COPY_MIN_SIZE = 1 << 20
+
+# Number of decoded files kept in the read cache
+FILE_CACHE_SIZE = 64
+
+# Total on-disk size of the files kept in the read cache; each entry holds a
+# few decoded copies of its file, so its memory use is a multiple of this
+FILE_CACHE_MAX_BYTES = 128 << 20
+
+# Files larger than this are never kept in the read cache
+FILE_CACHE_MAX_FILE_SIZE = 16 << 20
+
+# Number of file hashes kept in the hash cache
+HASH_CACHE_SIZE = 4096
+
+# A file modified this recently may change again without its mtime moving,
+# so it is only cached once its mtime is older than this window
+RACY_MTIME_WINDOW_NS = 2_000_000_000
+
+# What read_file_contents returns: content, start line, end line, content
+# hash, total lines and content size, followed by all lines of the file when
+# it is called with return_lines=True
+FileContents = Tuple[str, int, int, str, int, int]
+FileContentsWithLines = Tuple[str, int, int, str, int, int, List[str]]
+
+# (absolute path, encoding) -> cached file, least recently used first
+_file_cache: "OrderedDict[Tuple[str, str], _CachedFile]" = OrderedDict()
+_file_cache_lock = threading.Lock()
+
+# (absolute path, encoding) -> (stat identity, content hash) of files hashed
+# without reading them as text; guarded by _file_cache_lock
+_hash_cache: "OrderedDict[Tuple[str, str], Tuple[Tuple[int, ...], str]]" = OrderedDict()
+
+
+def _stat_identity(st: os.stat_result) -> Tuple[int, ...]:
+    """Fields that change whenever a file is rewritten or replaced."""
+    return (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def invalidate_file_cache(file_path: str) -> None:
+    """Drop every cached decoding and hash of a file."""
+    path = os.path.abspath(file_path)
+    with _file_cache_lock:
+        for key in [key for key in _file_cache if key[0] == path]:
+            del _file_cache[key]
+        for key in [key for key in _hash_cache if key[0] == path]:
+            del _hash_cache[key]
+
+
+# Characters str.splitlines() treats as line breaks but text-mode readlines()
+# does not ("\r" never survives universal newline translation)
+_EXTRA_LINE_BREAKS = ("\v", "\f", "\x1c", "\x1d", "\x1e", "\x85", "\u2028", "\u2029")
+
+
+def split_lines(text: str) -> List[str]:
+    """Split text on "\n" keeping line endings, exactly like ``readlines()``."""
+    if any(sep in text for sep in _EXTRA_LINE_BREAKS):
+        return io.StringIO(text).readlines()
+    return text.splitlines(keepends=True)
+
+
+def count_text_lines(text: str) -> int:
+    """Count the lines split_lines() would return without splitting."""
+    return text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+
+
+# Spellings of the default encoding, recognised without a codec lookup
+_UTF8_NAMES = frozenset({"utf-8", "utf8", "UTF-8", "UTF8"})
+
+
+def _is_utf8(encoding: Optional[str]) -> bool:
+    """Check whether an encoding name refers to plain UTF-8."""
+    if not encoding or encoding in _UTF8_NAMES:
+        return True
+    return _is_utf8_codec(encoding)
+
+
+@functools.lru_cache(maxsize=64)
+def _is_utf8_codec(encoding: str) -> bool:
+    """Resolve an encoding name through the codec registry, once per name."""
+    try:
+        return codecs.lookup(encoding).name == "utf-8"
+    except LookupError:
+        return False
+
+
+class EncodedLines:
+    """UTF-8 encoding of a file's lines with the byte offset of every line.
+
+    Range hashes are SHA-256 digests of the UTF-8 encoded range, so with one
+    encoded buffer and an offset table a range can be hashed through a
+    memoryview slice instead of joining and re-encoding its lines. Offsets
+    are kept in a flat ``array("q")`` rather than a list of int objects.
+    """
+
+    __slots__ = ("data", "offsets")
+
+    def __init__(
+        self,
+        lines: List[str],
+        text: Optional[str] = None,
+        data: Optional[bytes] = None,
+    ):
+        if text is None:
+            text = "".join(lines)
+        self.data = text.encode() if data is None else data
+        if text.isascii():
+            sizes = map(len, lines)
+        else:
+            sizes = (len(line.encode()) for line in lines)
+        self.offsets = array.array("q", itertools.accumulate(sizes, initial=0))
+
+    def byte_range(self, start: int, end: int) -> memoryview:
+        """Encoded bytes of lines[start:end], with the same clamping as slicing."""
+        start, end, _ = slice(start, end).indices(len(self.offsets) - 1)
+        begin = self.offsets[start]
+        stop = self.offsets[max(start, end)]
+        return memoryview(self.data)[begin:stop]
+
+    def hash_range(self, start: int, end: int) -> str:
+        """Hash lines[start:end], with the same clamping as list slicing."""
+        return BaseTextOperations.calculate_hash(self.byte_range(start, end))
+
+
+class _CachedFile:
+    """A decoded file in the read cache.
+
+    ``lines``, ``encoded_lines`` and the content hasher are filled in lazily,
+    the first time a caller needs them, and then shared by every later read
+    of the same file.
+    """
+
+    __slots__ = (
+        "identity",
+        "size",
+        "text",
+        "encoded",
+        "lines",
+        "encoded_lines",
+        "ends_with_cr",
+        "_hasher",
+    )
+
+    def __init__(
+        self,
+        identity: Tuple[int, ...],
+        text: str,
+        encoded: Optional[bytes],
+        lines: Optional[List[str]],
+        ends_with_cr: bool = False,
+    ):
+        self.identity = identity
+        # Size of the file on disk, charged against FILE_CACHE_MAX_BYTES
+        self.size = identity[2]
+        self.text = text
+        self.encoded = encoded
+        self.lines = lines
+        self.encoded_lines: Optional[EncodedLines] = None
+        # Whether the file on disk ends in a carriage return, which text
+        # mode reads as a newline
+        self.ends_with_cr = ends_with_cr
+        self._hasher: Any = None
+
+    def content_hasher(self) -> Any:
+        """Return the SHA-256 hasher of the text, hashing it on first use.
+
+        The hasher is shared; callers that update it must use a copy.
+        """
+        if self._hasher is None:
+            data = self.encoded if self.encoded is not None else self.text.encode()
+            self._hasher = hashlib.sha256(data, usedforsecurity=False)
+        return self._hasher
+
+
 class BaseTextOperations:
     """Base class for all text operations."""
 
@@ -17,19 +218,393 @@ class BaseTextOperations:
             raise ValueError("Path traversal not allowed")
 
     @staticmethod
-    def calculate_hash(content: str) -> str:
-        """Calculate SHA-256 hash of content."""
-        return hashlib.sha256(content.encode()).hexdigest()
-        
+    def calculate_hash(content: str | bytes | memoryview) -> str:
+        """Calculate SHA-256 hash of content.
+
+        ``str`` content is hashed as UTF-8; ``bytes`` are hashed as given so
+        callers already holding encoded data skip the encode step. The hash is
+        a content fingerprint for conflict detection, not a security
+        primitive, so it is created with ``usedforsecurity=False``.
+        """
+        if isinstance(content, str):
+            content = content.encode()
+        return hashlib.sha256(content, usedforsecurity=False).hexdigest()
+
+    def hash_file(
+        self, file_path: str, encoding: str = "utf-8", validate: bool = False
+    ) -> str:
+        """Calculate the content hash of a file without materializing its text.
+
+        The digest matches ``calculate_hash`` over the file read in text mode.
+        With ``validate``, a file that does not decode raises
+        ``UnicodeDecodeError`` as reading it would; otherwise UTF-8 files
+        streamed as raw bytes are hashed without being decoded.
+
+        Hashes computed with ``validate`` are kept in an LRU cache keyed by
+        the file's stat identity, so hashing an unchanged file again, as
+        repeated directory listings do, costs a stat instead of a read.
+        """
+        key = (os.path.abspath(file_path), encoding)
+        st = os.stat(file_path)
+        identity = _stat_identity(st)
+        with _file_cache_lock:
+            cached = _hash_cache.get(key)
+            if cached is not None and cached[0] == identity:
+                _hash_cache.move_to_end(key)
+                return cached[1]
+
+        hasher, _ = self._file_hasher(file_path, encoding, validate)
+        file_hash = hasher.hexdigest()
+
+        if validate and time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS:
+            with _file_cache_lock:
+                _hash_cache[key] = (identity, file_hash)
+                _hash_cache.move_to_end(key)
+                while len(_hash_cache) > HASH_CACHE_SIZE:
+                    _hash_cache.popitem(last=False)
+        return file_hash
+
+    def _file_hasher(
+        self, file_path: str, encoding: str = "utf-8", validate: bool = False
+    ) -> Tuple[Any, bool]:
+        """Return a SHA-256 hasher fed with a file's text-mode content.
+
+        UTF-8 files without carriage returns hash identically as raw bytes, so
+        they are streamed straight into the hasher; anything else (other
+        encodings, or newlines that text mode would translate) is decoded.
+
+        The second element tells whether text appended to the file can be fed
+        to the same hasher: a file ending in a lone carriage return would
+        merge with an appended newline when read back, so it cannot.
+
+        Files in the read cache are not read again; their hash is computed
+        once and kept with the cache entry.
+        """
+        entry = self._cached_file((os.path.abspath(file_path), encoding), file_path)
+        if entry is not None:
+            return entry.content_hasher().copy(), not entry.ends_with_cr
+
+        if _is_utf8(encoding):
+            hasher = hashlib.sha256(usedforsecurity=False)
+            decoder = codecs.getincrementaldecoder("utf-8")() if validate else None
+            with open(file_path, "rb") as f:
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    if b"\r" in chunk:
+                        break
+                    if decoder is not None:
+                        decoder.decode(chunk)
+                    hasher.update(chunk)
+                else:
+                    if decoder is not None:
+                        decoder.decode(b"", final=True)
+                    return hasher, True
+
+        # Read the bytes in one presized read and decode them in one call,
+        # rather than through the incremental decoder of a text stream
+        with open(file_path, "rb") as f:
+            content = f.read().decode(encoding)
+        resumable = not content.endswith("\r")
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return hashlib.sha256(content.encode(), usedforsecurity=False), resumable
+
+    def count_lines(self, file_path: str, encoding: str = "utf-8") -> int:
+        """Count the lines ``readlines()`` would return, without building them.
+
+        The file is decoded in large chunks and newlines are counted with
+        ``str.count``, so no per-line objects are created. Reading in text
+        mode keeps newline translation and decoding errors identical to
+        reading the lines.
+        """
+        count = 0
+        last = ""
+        with open(file_path, "r", encoding=encoding) as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                count += chunk.count("\n")
+                last = chunk
+        if last and not last.endswith("\n"):
+            count += 1
+        return count
+
+    def peek_lines(
+        self, file_path: str, num_lines: int, encoding: str = "utf-8"
+    ) -> Tuple[List[str], int, str]:
+        """Read the first lines of a file along with its line count and hash.
+
+        Returns the first ``num_lines`` lines as iterating the file in text
+        mode yields them, the number of such lines in the whole file, and the
+        content hash of the whole file. The file is read once, in large
+        text-mode chunks, so newline translation and decoding errors are
+        those of reading it; only the requested lines are split out.
+        """
+        hasher = hashlib.sha256(usedforsecurity=False)
+        head: List[str] = []
+        partial: List[str] = []
+        count = 0
+        last = ""
+        with open(file_path, "r", encoding=encoding) as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                hasher.update(chunk.encode())
+                count += chunk.count("\n")
+                last = chunk
+                if len(head) < num_lines:
+                    *complete, rest = chunk.split("\n")
+                    if complete:
+                        complete[0] = "".join(partial) + complete[0]
+                        partial = []
+                        head.extend(
+                            line + "\n" for line in complete[: num_lines - len(head)]
+                        )
+                    partial.append(rest)
+        if len(head) < num_lines and (tail := "".join(partial)):
+            head.append(tail)
+        if last and not last.endswith("\n"):
+            count += 1
+        return head, count, hasher.hexdigest()
+
+    def _read_text_lines(
+        self, file_path: str, encoding: str, split: bool = True
+    ) -> Tuple[str, Optional[List[str]], Optional[bytes]]:
+        """Read a file as text and split it into lines.
+
+        The file is read as bytes and decoded once, applying the same newline
+        translation as text mode. When the file is UTF-8 and needed no
+        translation, its bytes are exactly the encoded text and are returned
+        as well, so callers can size and hash it without encoding again;
+        otherwise the third element is None. With ``split=False`` the text is
+        not split and None is returned in place of the lines.
+
+        Unchanged files are served from an LRU cache keyed by their stat
+        identity (device, inode, size and mtime), so repeated reads of a file
+        skip the disk, decoding and splitting. The cache is bounded by entry
+        count and by the total size of the cached files; files larger than
+        FILE_CACHE_MAX_FILE_SIZE are not cached. The returned list is a copy
+        callers are free to modify.
+        """
+        key = (os.path.abspath(file_path), encoding)
+        entry = self._cached_file(key, file_path)
+        if entry is not None:
+            if not split:
+                return entry.text, None, entry.encoded
+            if entry.lines is None:
+                entry.lines = split_lines(entry.text)
+            return entry.text, entry.lines.copy(), entry.encoded
+
+        with open(file_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            buf = f.read()
+        data = buf.decode(encoding)
+        encoded = buf if _is_utf8(encoding) else None
+        ends_with_cr = False
+        if "\r" in data:
+            # Universal newlines, as reading in text mode would apply
+            ends_with_cr = data.endswith("\r")
+            data = data.replace("\r\n", "\n").replace("\r", "\n")
+            encoded = None
+        lines = split_lines(data) if split else None
+
+        if (
+            st.st_size <= FILE_CACHE_MAX_FILE_SIZE
+            and time.time_ns() - st.st_mtime_ns > RACY_MTIME_WINDOW_NS
+        ):
+            cached_lines = lines.copy() if lines is not None else None
+            with _file_cache_lock:
+                _file_cache[key] = _CachedFile(
+                    _stat_identity(st), data, encoded, cached_lines, ends_with_cr
+                )
+                _file_cache.move_to_end(key)
+                cached_bytes = sum(entry.size for entry in _file_cache.values())
+                while (
+                    len(_file_cache) > FILE_CACHE_SIZE
+                    or cached_bytes > FILE_CACHE_MAX_BYTES
+                ):
+                    cached_bytes -= _file_cache.popitem(last=False)[1].size
+        return data, lines, encoded
+
+    @staticmethod
+    def _cached_file(key: Tuple[str, str], file_path: str) -> Optional[_CachedFile]:
+        """Return the cache entry for a file if the file has not changed since."""
+        try:
+            identity = _stat_identity(os.stat(file_path))
+        except OSError:
+            return None
+        with _file_cache_lock:
+            entry = _file_cache.get(key)
+            if entry is None or entry.identity != identity:
+                return None
+            _file_cache.move_to_end(key)
+            return entry
+
+    def _text_hash(
+        self, file_path: str, encoding: str, text: str, encoded: Optional[bytes]
+    ) -> str:
+        """Return the hash of a file's whole text as read by ``_read_text_lines``.
+
+        ``encoded`` is the text's UTF-8 encoding when known. If the text is
+        that of the file's cache entry, the hash is computed once and kept
+        with the entry, so verifying an unchanged file does not rehash it.
+        """
+        with _file_cache_lock:
+            entry = _file_cache.get((os.path.abspath(file_path), encoding))
+        if entry is not None and entry.text is text:
+            return entry.content_hasher().hexdigest()
+        return self.calculate_hash(encoded if encoded is not None else text)
+
+    def _encoded_lines(
+        self, file_path: str, encoding: str, lines: List[str]
+    ) -> EncodedLines:
+        """Build the UTF-8 buffer and offsets of a file's lines for range hashing.
+
+        If the lines are those of a cached, unchanged file, the encoding is
+        reused from the cache (and stored there on first use), and a UTF-8
+        file's own bytes serve as the buffer, so successive edits of a file
+        do not re-encode every line each time.
+        """
+        entry = self._cached_file((os.path.abspath(file_path), encoding), file_path)
+        # Lines handed out by the cache share their str objects, so this
+        # comparison is an identity check per element
+        if entry is None or entry.lines != lines:
+            return EncodedLines(lines)
+        if entry.encoded_lines is None:
+            entry.encoded_lines = EncodedLines(lines, entry.text, entry.encoded)
+        return entry.encoded_lines
+
+    def _atomic_write_text(self, file_path: str, data: str, encoding: str) -> str:
+        """Replace a file's contents atomically and return their hash.
+
+        The text is encoded once and written as a single bytes buffer, with
+        newlines translated the way text mode would. When that buffer is the
+        UTF-8 text itself it is reused for the returned hash.
+        """
+        if os.linesep == "\n":
+            payload = data.encode(encoding)
+            content_hash = self.calculate_hash(payload if _is_utf8(encoding) else data)
+        else:
+            payload = data.replace("\n", os.linesep).encode(encoding)
+            content_hash = self.calculate_hash(data)
+        self._atomic_write_bytes(file_path, payload)
+        return content_hash
+
+    def _atomic_write_bytes(self, file_path: str, payload: bytes) -> None:
+        """Replace a file's contents atomically with already encoded bytes."""
+        self._atomic_replace(file_path, lambda f: f.write(payload))
+
+    def _atomic_write_lines(
+        self, file_path: str, lines: List[str], encoding: str, unchanged: int = 0
+    ) -> str:
+        """Replace a file with lines, of which the first ``unchanged`` are as read.
+
+        For a large unchanged prefix of a UTF-8 file that is still the cached
+        version whose encoding was used for range hashes, the prefix is
+        copied from the old file inside the kernel with ``os.sendfile`` and
+        only the rest is encoded and written. Otherwise this is
+        ``_atomic_write_text`` of the joined lines. Returns the new hash.
+        """
+        entry = self._cached_file((os.path.abspath(file_path), encoding), file_path)
+        encoded_lines = entry.encoded_lines if entry is not None else None
+        if (
+            entry is None
+            or encoded_lines is None
+            or entry.encoded is None
+            or os.linesep != "\n"
+            or not hasattr(os, "sendfile")
+        ):
+            return self._atomic_write_text(file_path, "".join(lines), encoding)
+
+        unchanged = max(0, min(unchanged, len(encoded_lines.offsets) - 1))
+        prefix_size = encoded_lines.offsets[unchanged]
+        if prefix_size < PREFIX_COPY_MIN_SIZE:
+            return self._atomic_write_text(file_path, "".join(lines), encoding)
+
+        with open(file_path, "rb") as source:
+            # Only copy from the file if it is still the version we read
+            if _stat_identity(os.fstat(source.fileno())) != entry.identity:
+                return self._atomic_write_text(file_path, "".join(lines), encoding)
+
+            tail = "".join(lines[unchanged:]).encode()
+            hasher = hashlib.sha256(
+                encoded_lines.byte_range(0, unchanged), usedforsecurity=False
+            )
+            hasher.update(tail)
+
+            def write(f: BinaryIO) -> None:
+                offset = 0
+                while offset < prefix_size:
+                    sent = os.sendfile(
+                        f.fileno(), source.fileno(), offset, prefix_size - offset
+                    )
+                    if not sent:
+                        raise OSError(f"Unexpected end of file: {file_path}")
+                    offset += sent
+                f.write(tail)
+
+            self._atomic_replace(file_path, write)
+        return hasher.hexdigest()
+
+    def _atomic_replace(
+        self, file_path: str, write: Callable[[BinaryIO], object]
+    ) -> None:
+        """Replace a file atomically with what ``write`` writes to a binary file.
+
+        The data is written to a temporary file next to the target, flushed to
+        disk and then renamed over it, so readers never observe a truncated or
+        partially written file. Symlinks are resolved so the link itself is
+        kept, and the permission bits of an existing file are preserved.
+        """
+        target = os.path.realpath(file_path)
+        invalidate_file_cache(file_path)
+        invalidate_file_cache(target)
+        fd, tmp_path = tempfile.mkstemp(
+            prefix=f".{os.path.basename(target)}.", dir=os.path.dirname(target)
+        )
+        try:
+            with open(fd, "wb") as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            try:
+                os.chmod(tmp_path, stat.S_IMODE(os.stat(target).st_mode))
+            except FileNotFoundError:
+                pass
+            os.replace(tmp_path, target)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    @overload
+    async def read_file_contents(
+        self,
+        file_path: str,
+        start: int = ...,
+        end: Optional[int] = ...,
+        encoding: str = ...,
+        return_lines: Literal[False] = ...,
+    ) -> FileContents: ...
+
+    @overload
+    async def read_file_contents(
+        self,
+        file_path: str,
+        start: int = ...,
+        end: Optional[int] = ...,
+        encoding: str = ...,
+        *,
+        return_lines: Literal[True],
+    ) -> FileContentsWithLines: ...
+
     async def read_file_contents(
         self,
         file_path: str,
         start: int = 1,
         end: Optional[int] = None,
         encoding: str = "utf-8",
-    ) -> Tuple[str, int, int, str, int, int]:
+        return_lines: bool = False,
+    ) -> FileContents | FileContentsWithLines:
         """Read file contents within specified line range.
-        
+
         Returns:
             Tuple containing:
             - content: The file content within the range
@@ -38,32 +613,54 @@ class BaseTextOperations:
             - content_hash: Hash of the content
             - total_lines: Total number of lines in the file
             - content_size: Size of the content in bytes
+            - lines: All lines of the file (only when return_lines is True)
         """
-        # Read the whole file
-        with open(file_path, "r", encoding=encoding) as f:
-            lines = f.readlines()
-            
-        total_lines = len(lines)
-        
+        # Read the whole file once and split it once; a whole-file read that
+        # does not need the lines only counts them
+        whole_file = start <= 1 and end is None and not return_lines
+        data, lines, file_bytes = await asyncio.to_thread(
+            self._read_text_lines, file_path, encoding, not whole_file
+        )
+
+        total_lines = count_text_lines(data) if lines is None else len(lines)
+
         # Adjust line numbers to 0-based index
         start_idx = max(1, start) - 1
         end_idx = total_lines if end is None else min(end, total_lines)
-        
+
         if start_idx >= total_lines:
             # Return empty content if start is beyond file
             empty_content = ""
             empty_hash = self.calculate_hash(empty_content)
-            return empty_content, start_idx + 1, start_idx + 1, empty_hash, total_lines, 0
-            
+            result = (
+                empty_content,
+                start_idx + 1,
+                start_idx + 1,
+                empty_hash,
+                total_lines,
+                0,
+            )
+            if return_lines:
+                assert lines is not None  # split whenever they are returned
+                return result + (lines,)
+            return result
+
         if end_idx < start_idx:
             raise ValueError("End line must be greater than or equal to start line")
-            
-        selected_lines = lines[start_idx:end_idx]
-        content = "".join(selected_lines)
-        content_hash = self.calculate_hash(content)
-        content_size = len(content.encode(encoding))
-        
-        return (
+
+        if lines is None or (start_idx == 0 and end_idx == total_lines):
+            content = data
+            encoded = file_bytes if file_bytes is not None else data.encode(encoding)
+            content_hash = self._text_hash(file_path, encoding, data, file_bytes)
+        else:
+            content = "".join(lines[start_idx:end_idx])
+            encoded = content.encode(encoding)
+            content_hash = self.calculate_hash(
+                encoded if _is_utf8(encoding) else content
+            )
+        content_size = len(encoded)
+
+        result = (
             content,
             start_idx + 1,
             end_idx,
@@ -71,3 +668,7 @@ class BaseTextOperations:
             total_lines,
             content_size,
         )
+        if return_lines:
+            assert lines is not None  # split whenever they are returned
+            return result + (lines,)
+        return result
@@ -1,9 +1,12 @@
 """Delete operations for TextEditor."""
 
+import asyncio
+import itertools
 import logging
+import os
 from typing import Any, Dict
 
-from .base_operations import BaseTextOperations
+from .base_operations import BaseTextOperations, _is_utf8
 from .models import DeleteTextFileContentsRequest
 
 logger = logging.getLogger(__name__)
@@ -35,15 +38,17 @@ class TextDeleteOperations(BaseTextOperations):
 
         try:
             (
-                current_content,
+                _,
                 _,
                 _,
                 current_hash,
                 total_lines,
                 _,
+                lines,
             ) = await self.read_file_contents(
                 request.file_path,
                 encoding=request.encoding or "utf-8",
+                return_lines=True,
             )
 
             # Check for conflicts
@@ -54,29 +59,39 @@ class TextDeleteOperations(BaseTextOperations):
                     "hash": current_hash,
                 }
 
-            # Split content into lines
-            lines = current_content.splitlines(keepends=True)
-
-            # Sort ranges in reverse order to handle line number shifts
-            sorted_ranges = sorted(request.ranges, key=lambda x: x.start, reverse=True)
-
-            for range_spec in sorted_ranges:
+            # Encode once, and only if a range hash has to be verified, so
+            # range hashes are computed over slices of a single buffer
+            encoded_lines = None
+            if any(range_spec.range_hash for range_spec in request.ranges):
+                encoded_lines = self._encoded_lines(
+                    request.file_path, request.encoding or "utf-8", lines
+                )
+
+            # Validate every range in file order before deleting anything
+            spans = []
+            previous = None
+            for range_spec in sorted(request.ranges, key=lambda x: x.start):
                 start = range_spec.start - 1  # Convert to 0-based
-                end = range_spec.end if range_spec.end is not None else len(lines)
+                end = range_spec.end if range_spec.end is not None else total_lines
 
                 # Validate range
-                if start < 0 or end > len(lines) or start >= end:
+                if start < 0 or end > total_lines or start >= end:
                     return {
                         "result": "error",
                         "reason": f"Invalid range: {range_spec.start}-{range_spec.end}",
                         "hash": current_hash,
                     }
 
+                if previous is not None and start < spans[-1][1]:
+                    return {
+                        "result": "error",
+                        "reason": f"Overlapping ranges: {previous.start}-{previous.end} and {range_spec.start}-{range_spec.end}",
+                        "hash": current_hash,
+                    }
+
                 # Verify range hash if provided
-                if range_spec.range_hash:
-                    selected_lines = lines[start:end]
-                    selected_content = "".join(selected_lines)
-                    range_hash = self.calculate_hash(selected_content)
+                if encoded_lines is not None and range_spec.range_hash:
+                    range_hash = encoded_lines.hash_range(start, end)
 
                     if range_hash != range_spec.range_hash:
                         return {
@@ -85,18 +100,32 @@ class TextDeleteOperations(BaseTextOperations):
                             "hash": current_hash,
                         }
 
-                # Delete the range
-                del lines[start:end]
+                spans.append((start, end))
+                previous = range_spec
+
+            # Keep the lines between the sorted spans instead of deleting each
+            # span, which shifts the list tail every time: flattening the spans
+            # to [0, s0, e0, s1, e1, ..., total] pairs up the kept intervals
+            bounds = [0, *itertools.chain.from_iterable(spans), total_lines]
+            kept = list(zip(bounds[::2], bounds[1::2]))
 
             # Write updated content back to file
-            new_content = "".join(lines)
-            with open(
-                request.file_path, "w", encoding=request.encoding or "utf-8"
-            ) as f:
-                f.write(new_content)
-
-            # Calculate new hash
-            new_hash = self.calculate_hash(new_content)
+            encoding = request.encoding or "utf-8"
+            if encoded_lines is not None and _is_utf8(encoding) and os.linesep == "\n":
+                # The kept lines are already encoded: write and hash slices of
+                # the original buffer instead of joining and re-encoding text
+                payload = b"".join(encoded_lines.byte_range(a, b) for a, b in kept)
+                await asyncio.to_thread(
+                    self._atomic_write_bytes, request.file_path, payload
+                )
+                new_hash = self.calculate_hash(payload)
+            else:
+                new_content = "".join(
+                    itertools.chain.from_iterable(lines[a:b] for a, b in kept)
+                )
+                new_hash = await asyncio.to_thread(
+                    self._atomic_write_text, request.file_path, new_content, encoding
+                )
 
             return {
                 "result": "ok",
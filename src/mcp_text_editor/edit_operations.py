@@ -1,13 +1,19 @@
 """Edit operations for TextEditor."""
 
+import asyncio
 import logging
 from typing import Any, Dict, List, Optional
 
+from pydantic import TypeAdapter
+
 from .base_operations import BaseTextOperations
 from .models import EditPatch
 
 logger = logging.getLogger(__name__)
 
+# Validator for the list of patches passed to edit_file_contents
+_EDIT_PATCH_LIST = TypeAdapter(List[EditPatch])
+
 
 class TextEditOperations(BaseTextOperations):
     """Handles text editing operations."""
@@ -37,13 +43,16 @@ class TextEditOperations(BaseTextOperations):
 
         try:
             (
-                current_content,
+                _,
                 _,
                 _,
                 current_hash,
                 total_lines,
                 _,
-            ) = await self.read_file_contents(file_path, encoding=encoding)
+                lines,
+            ) = await self.read_file_contents(
+                file_path, encoding=encoding, return_lines=True
+            )
 
             # Check for conflicts
             if current_hash != expected_file_hash:
@@ -55,21 +64,35 @@ class TextEditOperations(BaseTextOperations):
                     }
                 }
 
-            # Split content into lines
-            lines = current_content.splitlines(keepends=True)
-
-            # Apply patches
-            new_lines = lines.copy()
-            for patch_dict in patches:
-                patch = EditPatch.model_validate(patch_dict)
-                start = patch.start - 1  # Convert to 0-based
-                end = patch.end if patch.end is not None else len(lines)
+            patch_list = _EDIT_PATCH_LIST.validate_python(patches)
+
+            # Resolve each patch to its 0-based span; an open end runs to the
+            # end of the file and an empty range inserts at start
+            resolved = []
+            for patch in patch_list:
+                start = max(0, patch.start - 1)
+                end = patch.end if patch.end is not None else total_lines
+                resolved.append((start, max(start, end), patch))
+
+            # Validate patches and verify range hashes in file order against
+            # one encoded buffer before any patch is applied
+            encoded_lines = None
+            spans = []
+            previous = None
+            for start, end, patch in sorted(resolved, key=lambda r: r[:2]):
+                if previous is not None and start < spans[-1][1]:
+                    return {
+                        file_path: {
+                            "result": "error",
+                            "reason": f"Overlapping patches: {previous.start}-{previous.end} and {patch.start}-{patch.end}",
+                            "hash": current_hash,
+                        }
+                    }
 
-                # Verify range hash if provided
                 if patch.range_hash:
-                    selected_lines = lines[start:end]
-                    selected_content = "".join(selected_lines)
-                    range_hash = self.calculate_hash(selected_content)
+                    if encoded_lines is None:
+                        encoded_lines = self._encoded_lines(file_path, encoding, lines)
+                    range_hash = encoded_lines.hash_range(start, end)
 
                     if range_hash != patch.range_hash:
                         return {
@@ -80,17 +103,26 @@ class TextEditOperations(BaseTextOperations):
                             }
                         }
 
-                # Apply the patch
-                new_lines[start:end] = patch.contents.splitlines(keepends=True)
-
-            # Write the modified content
-            new_content = "".join(new_lines)
-
-            with open(file_path, "w", encoding=encoding) as f:
-                f.write(new_content)
-
-            # Calculate new hash
-            new_hash = self.calculate_hash(new_content)
+                spans.append((start, end, patch.contents))
+                previous = patch
+
+            # Build the patched file in one pass, taking the unchanged lines
+            # between patches as slices; contents are only joined, so they
+            # need not be split into lines
+            new_lines: List[str] = []
+            position = 0
+            for start, end, contents in spans:
+                new_lines += lines[position:start]
+                new_lines.append(contents)
+                position = end
+            new_lines += lines[position:]
+
+            # Write the modified content; lines above the first patch are
+            # unchanged
+            unchanged = spans[0][0] if spans else total_lines
+            new_hash = await asyncio.to_thread(
+                self._atomic_write_lines, file_path, new_lines, encoding, unchanged
+            )
 
             return {
                 file_path: {
@@ -153,15 +185,17 @@ class TextEditOperations(BaseTextOperations):
 
         try:
             (
-                current_content,
+                _,
                 _,
                 _,
                 current_hash,
                 total_lines,
                 _,
+                lines,
             ) = await self.read_file_contents(
                 file_path,
                 encoding=encoding,
+                return_lines=True,
             )
 
             if current_hash != file_hash:
@@ -171,9 +205,6 @@ class TextEditOperations(BaseTextOperations):
                     "hash": None,
                 }
 
-            # Split into lines, preserving line endings
-            lines = current_content.splitlines(keepends=True)
-
             # Determine insertion point
             if after is not None:
                 if after > total_lines:
@@ -202,11 +233,9 @@ class TextEditOperations(BaseTextOperations):
 
             # Join lines and write back to file
             final_content = "".join(lines)
-            with open(file_path, "w", encoding=encoding) as f:
-                f.write(final_content)
-
-            # Calculate new hash
-            new_hash = self.calculate_hash(final_content)
+            new_hash = await asyncio.to_thread(
+                self._atomic_write_text, file_path, final_content, encoding
+            )
 
             return {
                 "result": "ok",
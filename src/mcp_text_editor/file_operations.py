@@ -1,29 +1,142 @@
 """File read/write operations for TextEditor."""
 
+import asyncio
+import codecs
+import collections
 import datetime
+import itertools
 import logging
 import os
-from typing import Any, Dict, List, Optional, Tuple
-
-from .base_operations import BaseTextOperations
-from .models import FileRanges
+import stat
+import string
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncIterator,
+    BinaryIO,
+    Deque,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    overload,
+)
+
+from pydantic import TypeAdapter
+
+from .base_operations import (
+    COPY_CHUNK_SIZE,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_MAX_BYTES,
+    PREFETCH_MAX_SIZE,
+    BaseTextOperations,
+    FileContents,
+    FileContentsWithLines,
+    _is_utf8,
+    count_text_lines,
+)
+from .models import FileRange, FileRanges
 
 logger = logging.getLogger(__name__)
 
+# Validator for the list of files passed to read_multiple_ranges
+_FILE_RANGES_LIST = TypeAdapter(List[FileRanges])
+
+_HEADER_FIELDS = frozenset(
+    {"fileName", "relativePath", "fullPath", "numberOfLinesInserted", "dateInserted"}
+)
+
+
+def _parse_header_template(template: str) -> Optional[List[Tuple[str, Optional[str]]]]:
+    """Split a batch header template into literal text and field names.
+
+    Formatting a header is then a join rather than a parse per file.
+    Returns None if the template uses anything beyond plain field names
+    (format specs, conversions, indexing, unknown fields) or does not
+    parse, leaving it to ``str.format`` and its errors.
+    """
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+    parts = []
+    for literal, name, format_spec, conversion in parsed:
+        if name is not None and (
+            format_spec or conversion or name not in _HEADER_FIELDS
+        ):
+            return None
+        parts.append((literal, name))
+    return parts
+
+
+class _TextAppender:
+    """Append text to a file opened in binary append mode.
+
+    Text is encoded, with newlines translated, as a text-mode stream in
+    append mode would write it, and is fed to ``hasher`` as UTF-8. Unlike
+    a text stream, text and bytes that already are UTF-8 text can be mixed
+    without flushing in between, so everything shares the file's buffer.
+    """
+
+    __slots__ = ("file", "hasher", "raw", "_encoder")
+
+    def __init__(self, file: BinaryIO, encoding: str, hasher: Any) -> None:
+        self.file = file
+        self.hasher = hasher
+        # UTF-8 text with \n line endings is written as its UTF-8 bytes
+        self.raw = _is_utf8(encoding) and os.linesep == "\n"
+        self._encoder = codecs.getincrementalencoder(encoding)()
+        if file.tell() != 0:
+            # As a text stream does, skip the byte order mark mid-file
+            self._encoder.setstate(0)
+
+    def write(self, text: str) -> None:
+        encoded = text.encode()
+        self.hasher.update(encoded)
+        if not self.raw:
+            encoded = self._encoder.encode(text.replace("\n", os.linesep))
+        self.file.write(encoded)
+
+    def write_utf8(self, data: bytes) -> None:
+        """Write text given as its UTF-8 encoding."""
+        if not self.raw:
+            self.write(data.decode())
+            return
+        self.hasher.update(data)
+        self.file.write(data)
+
 
 class TextFileOperations(BaseTextOperations):
     """Handles basic file operations."""
 
     async def _read_file(
         self, file_path: str, encoding: str = "utf-8"
-    ) -> Tuple[List[str], str, int]:
-        """Read file and return lines, content, and total lines."""
+    ) -> Tuple[List[str], str, int, str]:
+        """Read file and return lines, content, total lines, and content hash.
+
+        The hash is taken over the file bytes when they are the UTF-8 text,
+        so the content is not encoded again just to hash it, and is kept
+        with the file's cache entry.
+        """
+        file_content, lines, file_bytes = await asyncio.to_thread(
+            self._read_file_data, file_path, encoding
+        )
+        assert lines is not None
+        file_hash = self._text_hash(file_path, encoding, file_content, file_bytes)
+        return lines, file_content, len(lines), file_hash
+
+    def _read_file_data(
+        self, file_path: str, encoding: str = "utf-8", split: bool = True
+    ) -> Tuple[str, Optional[List[str]], Optional[bytes]]:
+        """Read file and return content, lines, and the encoded content if known.
+
+        Lines are None when ``split`` is False. This blocks on file I/O, so
+        coroutines run it in a worker thread to keep the event loop free.
+        """
         self._validate_file_path(file_path)
         try:
-            with open(file_path, "r", encoding=encoding) as f:
-                lines = f.readlines()
-            file_content = "".join(lines)
-            return lines, file_content, len(lines)
+            return self._read_text_lines(file_path, encoding, split=split)
         except FileNotFoundError as err:
             raise FileNotFoundError(f"File not found: {file_path}") from err
         except UnicodeDecodeError as err:
@@ -38,56 +151,103 @@ class TextFileOperations(BaseTextOperations):
     async def read_multiple_ranges(
         self, ranges: List[Dict[str, Any]], encoding: str = "utf-8"
     ) -> Dict[str, Dict[str, Any]]:
-        result: Dict[str, Dict[str, Any]] = {}
-
-        for file_range_dict in ranges:
-            file_range = FileRanges.model_validate(file_range_dict)
-            file_path = file_range.file_path
-            lines, file_content, total_lines = await self._read_file(
-                file_path, encoding=encoding
+        # Validate the whole request in one call, and read each file once
+        # for all of its ranges, even if it is listed more than once
+        ranges_by_path: Dict[str, List[FileRange]] = {}
+        for file_range in _FILE_RANGES_LIST.validate_python(ranges):
+            ranges_by_path.setdefault(file_range.file_path, []).extend(
+                file_range.ranges
             )
-            file_hash = self.calculate_hash(file_content)
-            result[file_path] = {"ranges": [], "file_hash": file_hash}
-
-            for range_spec in file_range.ranges:
-                start = max(1, range_spec.start) - 1
-                end_value = range_spec.end
-                end = (
-                    min(total_lines, end_value)
-                    if end_value is not None
-                    else total_lines
-                )
 
-                if start >= total_lines:
-                    empty_content = ""
-                    result[file_path]["ranges"].append(
-                        {
-                            "content": empty_content,
-                            "start": start + 1,
-                            "end": start + 1,
-                            "range_hash": self.calculate_hash(empty_content),
-                            "total_lines": total_lines,
-                            "content_size": 0,
-                        }
-                    )
-                    continue
-
-                selected_lines = lines[start:end]
-                content = "".join(selected_lines)
-                range_hash = self.calculate_hash(content)
+        # Files are read concurrently, each in its own worker thread
+        results = await asyncio.gather(
+            *(
+                self._read_file_ranges(file_path, file_ranges, encoding)
+                for file_path, file_ranges in ranges_by_path.items()
+            )
+        )
+        return dict(zip(ranges_by_path, results))
 
-                result[file_path]["ranges"].append(
+    async def _read_file_ranges(
+        self, file_path: str, file_ranges: List[FileRange], encoding: str
+    ) -> Dict[str, Any]:
+        """Read the given line ranges of one file."""
+        lines, file_content, total_lines, file_hash = await self._read_file(
+            file_path, encoding=encoding
+        )
+        file_result: Dict[str, Any] = {"ranges": [], "file_hash": file_hash}
+        offsets: Optional[List[int]] = None
+        # Hashes by line span, so repeated ranges are hashed once and a
+        # range covering the whole file reuses the file hash
+        range_hashes = {(0, total_lines): file_hash}
+
+        for range_spec in file_ranges:
+            start = max(1, range_spec.start) - 1
+            end_value = range_spec.end
+            end = min(total_lines, end_value) if end_value is not None else total_lines
+
+            if start >= total_lines:
+                empty_content = ""
+                file_result["ranges"].append(
                     {
-                        "content": content,
+                        "content": empty_content,
                         "start": start + 1,
-                        "end": end,
-                        "range_hash": range_hash,
+                        "end": start + 1,
+                        "range_hash": self.calculate_hash(empty_content),
                         "total_lines": total_lines,
-                        "content_size": len(content),
+                        "content_size": 0,
                     }
                 )
+                continue
+
+            if start == 0 and end == total_lines:
+                content = file_content
+            elif len(file_ranges) > 1:
+                # Several ranges of one file: slice its text through a
+                # table of line offsets instead of joining each range
+                if offsets is None:
+                    offsets = list(itertools.accumulate(map(len, lines), initial=0))
+                content = file_content[offsets[start] : offsets[end]]
+            else:
+                content = "".join(lines[start:end])
+            range_hash = range_hashes.get((start, end))
+            if range_hash is None:
+                range_hash = self.calculate_hash(content)
+                range_hashes[start, end] = range_hash
+
+            file_result["ranges"].append(
+                {
+                    "content": content,
+                    "start": start + 1,
+                    "end": end,
+                    "range_hash": range_hash,
+                    "total_lines": total_lines,
+                    "content_size": len(content),
+                }
+            )
 
-        return result
+        return file_result
+
+    @overload
+    async def read_file_contents(
+        self,
+        file_path: str,
+        start: int = ...,
+        end: Optional[int] = ...,
+        encoding: str = ...,
+        return_lines: Literal[False] = ...,
+    ) -> FileContents: ...
+
+    @overload
+    async def read_file_contents(
+        self,
+        file_path: str,
+        start: int = ...,
+        end: Optional[int] = ...,
+        encoding: str = ...,
+        *,
+        return_lines: Literal[True],
+    ) -> FileContentsWithLines: ...
 
     async def read_file_contents(
         self,
@@ -95,12 +255,19 @@ class TextFileOperations(BaseTextOperations):
         start: int = 1,
         end: Optional[int] = None,
         encoding: str = "utf-8",
-    ) -> Tuple[str, int, int, str, int, int]:
-        """Read file contents within specified line range."""
-        # Call the base class implementation
-        lines, file_content, total_lines = await self._read_file(
-            file_path, encoding=encoding
+        return_lines: bool = False,
+    ) -> FileContents | FileContentsWithLines:
+        """Read file contents within specified line range.
+
+        When ``return_lines`` is True, the list of all file lines is appended
+        as a seventh element so callers can reuse it instead of re-splitting.
+        """
+        # A whole-file read that does not need the lines only counts them
+        whole_file = start <= 1 and end is None and not return_lines
+        file_content, lines, file_bytes = await asyncio.to_thread(
+            self._read_file_data, file_path, encoding, not whole_file
         )
+        total_lines = count_text_lines(file_content) if lines is None else len(lines)
 
         if end is not None and end < start:
             raise ValueError("End line must be greater than or equal to start line")
@@ -111,16 +278,31 @@ class TextFileOperations(BaseTextOperations):
         if start >= total_lines:
             empty_content = ""
             empty_hash = self.calculate_hash(empty_content)
-            return empty_content, start, start, empty_hash, total_lines, 0
+            result = (empty_content, start, start, empty_hash, total_lines, 0)
+            if return_lines:
+                assert lines is not None  # split whenever they are returned
+                return result + (lines,)
+            return result
         if end < start:
             raise ValueError("End line must be greater than or equal to start line")
 
-        selected_lines = lines[start:end]
-        content = "".join(selected_lines)
-        content_hash = self.calculate_hash(content)
-        content_size = len(content.encode(encoding))
+        if lines is None or (start == 0 and end == total_lines):
+            # The whole file: reuse its text, and its bytes when they are the
+            # encoded text, instead of joining and encoding again
+            content = file_content
+            encoded = file_bytes if file_bytes is not None else content.encode(encoding)
+            content_hash = self._text_hash(
+                file_path, encoding, file_content, file_bytes
+            )
+        else:
+            content = "".join(lines[start:end])
+            encoded = content.encode(encoding)
+            content_hash = self.calculate_hash(
+                encoded if _is_utf8(encoding) else content
+            )
+        content_size = len(encoded)
 
-        return (
+        result = (
             content,
             start + 1,
             end,
@@ -128,6 +310,109 @@ class TextFileOperations(BaseTextOperations):
             total_lines,
             content_size,
         )
+        if return_lines:
+            assert lines is not None  # split whenever they are returned
+            return result + (lines,)
+        return result
+
+    def _copy_text(
+        self, source_file_path: str, appender: "_TextAppender", encoding: str
+    ) -> Tuple[int, bool]:
+        """Append a source file's text through an appender.
+
+        Returns the number of lines appended, counted as ``readlines()``
+        would, and whether the text is not empty and lacks a final newline.
+
+        When the appender writes UTF-8 text as it is, the source bytes
+        already are the encoded text, so they are copied in large binary
+        chunks: text mode's newline translation is applied to the bytes
+        directly, and an incremental decoder only validates them so invalid
+        input still fails as it would in text mode. Otherwise the text is
+        decoded and re-encoded in chunks.
+        """
+        newlines = 0
+        if not appender.raw:
+            last_chunk = ""
+            with open(source_file_path, "r", encoding=encoding) as source_file:
+                while chunk := source_file.read(COPY_CHUNK_SIZE):
+                    appender.write(chunk)
+                    newlines += chunk.count("\n")
+                    last_chunk = chunk
+            needs_newline = bool(last_chunk) and not last_chunk.endswith("\n")
+            return newlines + needs_newline, needs_newline
+
+        decoder = codecs.getincrementaldecoder(encoding)()
+        last_chunk = b""
+        with open(source_file_path, "rb") as source_file:
+            while chunk := source_file.read(COPY_CHUNK_SIZE):
+                decoder.decode(chunk)
+                if b"\r" in chunk:
+                    # Keep a CRLF split across chunks together
+                    while chunk.endswith(b"\r") and (extra := source_file.read(1)):
+                        decoder.decode(extra)
+                        chunk += extra
+                    chunk = chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+                appender.write_utf8(chunk)
+                newlines += chunk.count(b"\n")
+                last_chunk = chunk
+            decoder.decode(b"", final=True)
+        needs_newline = bool(last_chunk) and not last_chunk.endswith(b"\n")
+        return newlines + needs_newline, needs_newline
+
+    async def _prefetched_sources(
+        self, sources: List[Tuple[str, int]], encoding: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield batch append sources in order, reading small ones ahead.
+
+        ``sources`` are (path, size) pairs. Each is yielded with its text and,
+        when known, its UTF-8 encoding; with None for files above
+        ``PREFETCH_MAX_SIZE``, which the caller streams instead; or with the
+        exception reading it raised. Up to ``PREFETCH_CONCURRENCY`` sources
+        totalling at most ``PREFETCH_MAX_BYTES`` are read ahead in worker
+        threads, and a source's budget is released once the caller is done
+        with it.
+        """
+        # (path, size, read task or None to stream) in source order
+        window: Deque[Tuple[str, int, Optional[asyncio.Task]]] = collections.deque()
+        window_bytes = 0
+        upcoming = iter(sources)
+        next_source = next(upcoming, None)
+        try:
+            while window or next_source is not None:
+                # Read ahead while the window has room; a source that does not
+                # fit the byte budget waits for the ones before it
+                while next_source is not None and len(window) < PREFETCH_CONCURRENCY:
+                    path, size = next_source
+                    if size > PREFETCH_MAX_SIZE:
+                        window.append((path, 0, None))
+                    elif window_bytes + size <= PREFETCH_MAX_BYTES:
+                        task = asyncio.create_task(
+                            asyncio.to_thread(
+                                self._read_text_lines, path, encoding, False
+                            )
+                        )
+                        window.append((path, size, task))
+                        window_bytes += size
+                    else:
+                        break
+                    next_source = next(upcoming, None)
+
+                path, size, task = window.popleft()
+                source: Any = None
+                if task is not None:
+                    try:
+                        text, _, encoded = await task
+                        source = (text, encoded)
+                    except Exception as e:
+                        source = e
+                yield path, source
+                # The caller has appended the source; release its budget
+                source = None
+                window_bytes -= size
+        finally:
+            for _, _, pending in window:
+                if pending is not None:
+                    pending.cancel()
 
     async def append_text_file_from_path(
         self,
@@ -170,18 +455,12 @@ class TextFileOperations(BaseTextOperations):
                     "hash": None,
                 }
 
-            # Verify target file hash
-            (
-                current_content,
-                _,
-                _,
-                current_hash,
-                total_lines,
-                _,
-            ) = await self.read_file_contents(
-                target_file_path,
-                encoding=encoding,
+            # Verify target file hash; the hasher is kept and fed the appended
+            # text, so the target is not read a second time afterwards
+            hasher, resumable = await asyncio.to_thread(
+                self._file_hasher, target_file_path, encoding
             )
+            current_hash = hasher.hexdigest()
 
             if current_hash != target_file_hash:
                 return {
@@ -191,25 +470,22 @@ class TextFileOperations(BaseTextOperations):
                 }
 
             # Open the target file in append mode
-            with open(target_file_path, "a", encoding=encoding) as target_file:
+            with open(target_file_path, "ab", buffering=COPY_CHUNK_SIZE) as target_file:
+                appender = _TextAppender(target_file, encoding, hasher)
                 # Open the source file and copy its content to the target file
-                with open(source_file_path, "r", encoding=encoding) as source_file:
-                    # Read the source file content in chunks to avoid loading large files into memory
-                    chunk_size = 8192  # 8KB chunks
-                    while True:
-                        chunk = source_file.read(chunk_size)
-                        if not chunk:
-                            break
-                        target_file.write(chunk)
-
+                _, needs_newline = await asyncio.to_thread(
+                    self._copy_text, source_file_path, appender, encoding
+                )
+                if needs_newline:
                     # Ensure the file ends with a newline
-                    if chunk and not chunk.endswith("\n"):
-                        target_file.write("\n")
+                    appender.write("\n")
 
-            # Read the updated file to calculate the new hash
-            with open(target_file_path, "r", encoding=encoding) as f:
-                updated_content = f.read()
-                new_hash = self.calculate_hash(updated_content)
+            if resumable:
+                new_hash = hasher.hexdigest()
+            else:
+                new_hash = await asyncio.to_thread(
+                    self.hash_file, target_file_path, encoding
+                )
 
             return {
                 "result": "ok",
@@ -230,10 +506,9 @@ class TextFileOperations(BaseTextOperations):
                 "hash": None,
             }
         except Exception as e:
-            import traceback
-
             logger.error(f"Error: {str(e)}")
-            logger.error(f"Traceback:\n{traceback.format_exc()}")
+            # Only format the traceback when debug logging will show it
+            logger.debug("Traceback:", exc_info=True)
             return {
                 "result": "error",
                 "reason": f"Error: {str(e)}",
@@ -281,18 +556,12 @@ class TextFileOperations(BaseTextOperations):
                     "hash": None,
                 }
 
-            # Verify target file hash
-            (
-                current_content,
-                _,
-                _,
-                current_hash,
-                _,
-                _,
-            ) = await self.read_file_contents(
-                target_file_path,
-                encoding=encoding,
+            # Verify target file hash; the hasher is kept and fed the appended
+            # text, so the target is not read a second time afterwards
+            hasher, resumable = await asyncio.to_thread(
+                self._file_hasher, target_file_path, encoding
             )
+            current_hash = hasher.hexdigest()
 
             if current_hash != target_file_hash:
                 return {
@@ -302,88 +571,136 @@ class TextFileOperations(BaseTextOperations):
                 }
 
             # Open the target file in append mode
-            with open(target_file_path, "a", encoding=encoding) as target_file:
+            with open(target_file_path, "ab", buffering=COPY_CHUNK_SIZE) as target_file:
+                appender = _TextAppender(target_file, encoding, hasher)
                 appended_files = []
                 current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                header_parts = (
+                    _parse_header_template(structure_template)
+                    if use_structured_format
+                    else None
+                )
+                header_needs_count = use_structured_format and (
+                    header_parts is None
+                    or any(name == "numberOfLinesInserted" for _, name in header_parts)
+                )
+                relative_to_base = (
+                    use_structured_format
+                    and bool(base_directory)
+                    and os.path.isdir(base_directory)
+                )
 
-                for source_file_path in source_file_paths:
-                    # Skip if source file doesn't exist
-                    if not os.path.exists(source_file_path) or not os.path.isfile(
-                        source_file_path
-                    ):
-                        continue
-
+                # Skip source files that don't exist, and read the small ones
+                # ahead in worker threads while appending in order
+                existing_sources = []
+                for path in source_file_paths:
                     try:
-                        # Count lines in the source file
-                        with open(
-                            source_file_path, "r", encoding=encoding
-                        ) as source_file:
-                            source_lines = list(source_file)
-                            line_count = len(source_lines)
-
-                        file_info = {
-                            "path": source_file_path,
-                            "lines_appended": line_count,
-                            "date_appended": current_date,
-                        }
-
-                        # Add structured header if requested
-                        if use_structured_format:
-                            file_name = os.path.basename(source_file_path)
-                            relative_path = source_file_path
-
-                            # Calculate relative path if base directory is provided
-                            if base_directory and os.path.isdir(base_directory):
-                                try:
-                                    relative_path = os.path.relpath(
-                                        source_file_path, base_directory
+                        st = os.stat(path)
+                    except (OSError, ValueError):
+                        continue
+                    if stat.S_ISREG(st.st_mode):
+                        existing_sources.append((path, st.st_size))
+
+                async with aclosing(
+                    self._prefetched_sources(existing_sources, encoding)
+                ) as sources:
+                    async for source_file_path, source in sources:
+                        try:
+                            if isinstance(source, BaseException):
+                                raise source
+
+                            # Count lines in the source file; a streamed source is
+                            # counted while it is copied, unless its header needs
+                            # the count first
+                            line_count: Optional[int] = None
+                            if source is not None:
+                                line_count = count_text_lines(source[0])
+                            elif header_needs_count:
+                                line_count = await asyncio.to_thread(
+                                    self.count_lines, source_file_path, encoding
+                                )
+
+                            # Add structured header if requested
+                            if use_structured_format:
+                                file_name = os.path.basename(source_file_path)
+                                relative_path = source_file_path
+
+                                # Calculate relative path if base directory is provided
+                                if relative_to_base:
+                                    try:
+                                        relative_path = os.path.relpath(
+                                            source_file_path, base_directory
+                                        )
+                                    except ValueError:
+                                        # Fall back to absolute path if relpath fails
+                                        relative_path = source_file_path
+
+                                # Format the structured header
+                                fields = {
+                                    "fileName": file_name,
+                                    "relativePath": relative_path,
+                                    "fullPath": source_file_path,
+                                    "numberOfLinesInserted": line_count,
+                                    "dateInserted": current_date,
+                                }
+                                if header_parts is not None:
+                                    header = "".join(
+                                        literal + str(fields[name]) if name else literal
+                                        for literal, name in header_parts
                                     )
-                                except ValueError:
-                                    # Fall back to absolute path if relpath fails
-                                    relative_path = source_file_path
-
-                            # Format the structured header
-                            header = structure_template.format(
-                                fileName=file_name,
-                                relativePath=relative_path,
-                                fullPath=source_file_path,
-                                numberOfLinesInserted=line_count,
-                                dateInserted=current_date,
+                                else:
+                                    header = structure_template.format(**fields)
+
+                                appender.write(header)
+                                # Text mode reads a carriage return back as a newline
+                                resumable = resumable and "\r" not in header
+
+                            # Append the source file content
+                            if source is None:
+                                copied_lines, needs_newline = await asyncio.to_thread(
+                                    self._copy_text,
+                                    source_file_path,
+                                    appender,
+                                    encoding,
+                                )
+                                if line_count is None:
+                                    line_count = copied_lines
+                            else:
+                                text, encoded = source
+                                if encoded is not None:
+                                    appender.write_utf8(encoded)
+                                else:
+                                    appender.write(text)
+                                needs_newline = bool(text) and not text.endswith("\n")
+                                # Drop the prefetched buffer now it is written
+                                del source, text, encoded
+                            if needs_newline:
+                                # Ensure the file ends with a newline
+                                appender.write("\n")
+
+                            appended_files.append(
+                                {
+                                    "path": source_file_path,
+                                    "lines_appended": line_count,
+                                    "date_appended": current_date,
+                                }
                             )
-
-                            target_file.write(header)
-
-                        # Append the source file content
-                        with open(
-                            source_file_path, "r", encoding=encoding
-                        ) as source_file:
-                            # Read and write in chunks
-                            chunk_size = 8192  # 8KB chunks
-                            while True:
-                                chunk = source_file.read(chunk_size)
-                                if not chunk:
-                                    break
-                                target_file.write(chunk)
-
-                            # Ensure the file ends with a newline
-                            if source_lines and not source_lines[-1].endswith("\n"):
-                                target_file.write("\n")
-
-                        appended_files.append(file_info)
-                    except Exception as e:
-                        logger.error(
-                            f"Error appending from {source_file_path}: {str(e)}"
-                        )
-                        file_info = {
-                            "path": source_file_path,
-                            "error": str(e),
-                        }
-                        appended_files.append(file_info)
-
-            # Read the updated file to calculate the new hash
-            with open(target_file_path, "r", encoding=encoding) as f:
-                updated_content = f.read()
-                new_hash = self.calculate_hash(updated_content)
+                        except Exception as e:
+                            logger.error(
+                                f"Error appending from {source_file_path}: {str(e)}"
+                            )
+                            file_info = {
+                                "path": source_file_path,
+                                "error": str(e),
+                            }
+                            appended_files.append(file_info)
+
+            if resumable:
+                new_hash = hasher.hexdigest()
+            else:
+                new_hash = await asyncio.to_thread(
+                    self.hash_file, target_file_path, encoding
+                )
 
             return {
                 "result": "ok",
@@ -406,10 +723,9 @@ class TextFileOperations(BaseTextOperations):
                 "hash": None,
             }
         except Exception as e:
-            import traceback
-
             logger.error(f"Error: {str(e)}")
-            logger.error(f"Traceback:\n{traceback.format_exc()}")
+            # Only format the traceback when debug logging will show it
+            logger.debug("Traceback:", exc_info=True)
             return {
                 "result": "error",
                 "reason": f"Error: {str(e)}",
@@ -1,6 +1,6 @@
 """Handler for appending content from one file to another."""
 
-import json
+import asyncio
 import logging
 import os
 import traceback
@@ -8,7 +8,7 @@ from typing import Any, Dict, Sequence
 
 from mcp.types import TextContent, Tool
 
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
@@ -123,11 +123,15 @@ class AppendTextFileFromPathHandler(BaseHandler):
             if not os.path.exists(target_file_path):
                 raise RuntimeError(f"Target file does not exist: {target_file_path}")
 
-            # Check which source files exist and which don't
+            # Check which source files exist and which don't, with one stat
+            # per source, made in a worker thread
+            is_file = await asyncio.to_thread(
+                list, map(os.path.isfile, source_file_paths)
+            )
             valid_sources = []
             invalid_sources = []
-            for source_path in source_file_paths:
-                if os.path.exists(source_path) and os.path.isfile(source_path):
+            for source_path, source_is_file in zip(source_file_paths, is_file):
+                if source_is_file:
                     valid_sources.append(source_path)
                 else:
                     invalid_sources.append(
@@ -155,7 +159,7 @@ class AppendTextFileFromPathHandler(BaseHandler):
             if invalid_sources:
                 result["invalid_sources"] = invalid_sources
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dump_result(result))]
 
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
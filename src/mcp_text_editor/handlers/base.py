@@ -1,6 +1,7 @@
 """Base handler for MCP Text Editor."""
 
 import abc
+import json
 from typing import Any, Dict, Sequence
 
 from mcp.types import TextContent, Tool
@@ -8,6 +9,16 @@ from mcp.types import TextContent, Tool
 from ..text_editor import TextEditor
 
 
+def dump_result(result: Any) -> str:
+    """Serialize a tool result as compact JSON.
+
+    Results are read by the client, not by people, so no indentation or
+    newlines are added; this keeps large batch results small and cheap to
+    produce. The ": " key separator is kept, as clients match on it.
+    """
+    return json.dumps(result, separators=(",", ": "))
+
+
 class BaseHandler(abc.ABC):
     """Base class for handlers.
 
@@ -80,7 +91,7 @@ class BaseHandler(abc.ABC):
                 try:
                     # Process arguments and perform operations using self.editor
                     result = await self.editor.some_operation(arguments)
-                    return [TextContent(type="text", text=json.dumps(result, indent=2))]
+                    return [TextContent(type="text", text=dump_result(result))]
                 except Exception as e:
                     raise RuntimeError(f"Error processing request: {str(e)}") from e
             ```
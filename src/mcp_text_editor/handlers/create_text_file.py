@@ -1,6 +1,5 @@
 """Handler for creating new text files."""
 
-import json
 import logging
 import os
 import traceback
@@ -8,7 +7,7 @@ from typing import Any, Dict, Sequence
 
 from mcp.types import TextContent, Tool
 
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
@@ -79,7 +78,7 @@ class CreateTextFileHandler(BaseHandler):
                 ],
                 encoding=encoding,
             )
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dump_result(result))]
 
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
@@ -1,6 +1,5 @@
 """Handler for deleting content from text files."""
 
-import json
 import logging
 import os
 import traceback
@@ -9,7 +8,7 @@ from typing import Any, Dict, Sequence
 from mcp.types import TextContent, Tool
 
 from ..models import DeleteTextFileContentsRequest, FileRange
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
@@ -113,9 +112,7 @@ class DeleteTextFileContentsHandler(BaseHandler):
             for file_path, edit_result in result_dict.items():
                 serializable_result[file_path] = edit_result.to_dict()
 
-            return [
-                TextContent(type="text", text=json.dumps(serializable_result, indent=2))
-            ]
+            return [TextContent(type="text", text=dump_result(serializable_result))]
 
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
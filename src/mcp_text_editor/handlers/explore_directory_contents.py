@@ -1,17 +1,83 @@
 """Handler for exploring directory contents."""
 
-import json
+import asyncio
+import itertools
 import logging
 import os
 import traceback
-from typing import Any, Dict, List, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
 from mcp.types import TextContent, Tool
 
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
+# Files hashed at once in worker threads, which bounds open file descriptors
+HASH_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)
+
+# Files larger than this are listed without a hash unless the caller raises it
+MAX_HASH_SIZE = 100 << 20
+
+# Worker threads listing the directories of a level; directory reads serialize in
+# the filesystem, so more threads than this rarely help
+WALK_CONCURRENCY = min(4, os.cpu_count() or 1)
+
+
+def _name_key(item: Dict[str, Any]) -> str:
+    """Sort key ordering entries by name, ignoring case."""
+    return item["name"].lower()
+
+
+def _scan_directory(
+    directory_path: str, include_sizes: bool = True
+) -> List[Dict[str, Any]]:
+    """List the entries of one directory, directories first, then by name.
+
+    File sizes are only looked up, with a stat, if ``include_sizes`` is set.
+    """
+    # Directories and files are collected apart, so each group is sorted by
+    # name alone rather than by a tuple key
+    directories: List[Dict[str, Any]] = []
+    files: List[Dict[str, Any]] = []
+    try:
+        with os.scandir(directory_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    directories.append(
+                        {
+                            "name": entry.name,
+                            "path": entry.path,
+                            "is_directory": True,
+                            "size": None,
+                        }
+                    )
+                else:
+                    files.append(
+                        {
+                            "name": entry.name,
+                            "path": entry.path,
+                            "is_directory": False,
+                            "size": entry.stat().st_size if include_sizes else None,
+                        }
+                    )
+    except PermissionError:
+        return [{"error": f"Permission denied accessing {directory_path}"}]
+    except Exception as e:
+        return [{"error": f"Error exploring directory: {str(e)}"}]
+
+    # Sort contents: directories first, then files alphabetically
+    directories.sort(key=_name_key)
+    files.sort(key=_name_key)
+    return directories + files
+
+
+def _scan_directories(
+    directory_paths: List[str], include_sizes: bool = True
+) -> List[List[Dict[str, Any]]]:
+    """List several directories, one after another, in the calling thread."""
+    return [_scan_directory(path, include_sizes) for path in directory_paths]
+
 
 class ExploreDirectoryContentsHandler(BaseHandler):
     """Handler for exploring directory contents and listing files with hashes."""
@@ -41,6 +107,16 @@ class ExploreDirectoryContentsHandler(BaseHandler):
                         "description": "Whether to include file hashes in the output.",
                         "default": True,
                     },
+                    "include_sizes": {
+                        "type": "boolean",
+                        "description": "Whether to include file sizes in the output. Sizes are null when disabled, which saves a stat per file.",
+                        "default": True,
+                    },
+                    "max_hash_size": {
+                        "type": "integer",
+                        "description": "Files larger than this many bytes are listed without a hash (default: 100 MiB).",
+                        "default": MAX_HASH_SIZE,
+                    },
                     "encoding": {
                         "type": "string",
                         "description": "Text encoding for calculating file hashes (default: 'utf-8')",
@@ -60,6 +136,8 @@ class ExploreDirectoryContentsHandler(BaseHandler):
             directory_path = arguments["directory_path"]
             include_subdirectories = arguments.get("include_subdirectories", True)
             include_file_hashes = arguments.get("include_file_hashes", True)
+            include_sizes = arguments.get("include_sizes", True)
+            max_hash_size = arguments.get("max_hash_size", MAX_HASH_SIZE)
             encoding = arguments.get("encoding", "utf-8")
 
             if not os.path.isabs(directory_path):
@@ -79,10 +157,12 @@ class ExploreDirectoryContentsHandler(BaseHandler):
                     include_subdirectories,
                     include_file_hashes,
                     encoding,
+                    include_sizes,
+                    max_hash_size,
                 ),
             }
 
-            return [TextContent(type="text", text=json.dumps(result, indent=2))]
+            return [TextContent(type="text", text=dump_result(result))]
 
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
@@ -95,47 +175,105 @@ class ExploreDirectoryContentsHandler(BaseHandler):
         include_subdirectories: bool,
         include_file_hashes: bool,
         encoding: str,
+        include_sizes: bool = True,
+        max_hash_size: Optional[int] = MAX_HASH_SIZE,
     ) -> List[Dict[str, Any]]:
-        """Explore directory and get contents with structure."""
-        contents = []
+        """Explore directory and get contents with structure.
+
+        The tree is walked one level at a time: the directories of a level
+        are split between ``WALK_CONCURRENCY`` worker threads that list them,
+        while the files found so far are hashed in other worker threads, at
+        most ``HASH_CONCURRENCY`` at once.
+        """
+        hash_semaphore = asyncio.Semaphore(HASH_CONCURRENCY)
+        contents: List[Dict[str, Any]] = []
+        hashes = []
+        # Directories of the current level, with the lists to fill in
+        level = [(directory_path, contents)]
 
         try:
-            with os.scandir(directory_path) as entries:
-                for entry in entries:
-                    item = {
-                        "name": entry.name,
-                        "path": entry.path,
-                        "is_directory": entry.is_dir(),
-                        "size": entry.stat().st_size if not entry.is_dir() else None,
-                    }
-
-                    if not entry.is_dir() and include_file_hashes:
-                        try:
-                            with open(entry.path, "r", encoding=encoding) as f:
-                                content = f.read()
-                                item["hash"] = self.editor.calculate_hash(content)
-                        except (UnicodeDecodeError, IOError):
-                            # For binary files or those that can't be read with the specified encoding
-                            item["hash"] = None
-                            item["hash_error"] = (
-                                "Could not calculate hash (possibly binary file or encoding error)"
+            while level:
+                # Each thread lists every WALK_CONCURRENCY-th directory
+                parts = [level[i::WALK_CONCURRENCY] for i in range(WALK_CONCURRENCY)]
+                listings = await asyncio.gather(
+                    *(
+                        asyncio.to_thread(
+                            _scan_directories,
+                            [path for path, _ in part],
+                            include_sizes,
+                        )
+                        for part in parts
+                        if part
+                    )
+                )
+                next_level = []
+                for (_, directory_contents), listing in zip(
+                    itertools.chain.from_iterable(parts),
+                    itertools.chain.from_iterable(listings),
+                ):
+                    directory_contents.extend(listing)
+                    for item in listing:
+                        if "error" in item:
+                            continue
+                        if item["is_directory"]:
+                            if include_subdirectories:
+                                item["contents"] = []
+                                next_level.append((item["path"], item["contents"]))
+                        elif include_file_hashes:
+                            hashes.append(
+                                asyncio.create_task(
+                                    self._hash_file(
+                                        item,
+                                        item["path"],
+                                        encoding,
+                                        max_hash_size,
+                                        hash_semaphore,
+                                    )
+                                )
                             )
+                level = next_level
 
-                    if entry.is_dir() and include_subdirectories:
-                        item["contents"] = await self._explore_directory(
-                            entry.path,
-                            include_subdirectories,
-                            include_file_hashes,
-                            encoding,
-                        )
+            await asyncio.gather(*hashes)
+            return contents
+        finally:
+            # Do not leave hashes running if the walk was cancelled
+            for task in hashes:
+                task.cancel()
 
-                    contents.append(item)
+    async def _hash_file(
+        self,
+        item: Dict[str, Any],
+        file_path: str,
+        encoding: str,
+        max_hash_size: Optional[int],
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        """Add the content hash of a file to its entry.
 
-                # Sort contents: directories first, then files alphabetically
-                contents.sort(key=lambda x: (not x["is_directory"], x["name"].lower()))
+        Files larger than ``max_hash_size`` bytes are not read; their entry
+        says why they have no hash. None hashes files of any size.
+        """
+        size = item["size"]
+        async with semaphore:
+            try:
+                if max_hash_size is not None:
+                    if size is None:
+                        size = (await asyncio.to_thread(os.stat, file_path)).st_size
+                    if size > max_hash_size:
+                        item["hash"] = None
+                        item["hash_skipped_reason"] = (
+                            f"File is larger than max_hash_size ({max_hash_size} bytes)"
+                        )
+                        return
 
-                return contents
-        except PermissionError:
-            return [{"error": f"Permission denied accessing {directory_path}"}]
-        except Exception as e:
-            return [{"error": f"Error exploring directory: {str(e)}"}]
+                # Streamed in chunks rather than read whole
+                item["hash"] = await asyncio.to_thread(
+                    self.editor.hash_file, file_path, encoding, validate=True
+                )
+            except (UnicodeDecodeError, LookupError, IOError):
+                # For binary files, unknown encodings, or files that can't be
+                # read with the specified encoding
+                item["hash"] = None
+                item["hash_error"] = (
+                    "Could not calculate hash (possibly binary file or encoding error)"
+                )
@@ -1,6 +1,5 @@
 """Handler for getting text file contents."""
 
-import json
 import logging
 import os
 import traceback
@@ -8,7 +7,7 @@ from typing import Any, Dict, Sequence
 
 from mcp.types import TextContent, Tool
 
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
@@ -91,7 +90,7 @@ class GetTextFileContentsHandler(BaseHandler):
             )
             response = result
 
-            return [TextContent(type="text", text=json.dumps(response, indent=2))]
+            return [TextContent(type="text", text=dump_result(response))]
 
         except KeyError as e:
             logger.error(f"Missing required argument: '{e}'")
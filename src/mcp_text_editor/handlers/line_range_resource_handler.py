@@ -1,5 +1,7 @@
 """Handler for line-range resource access."""
 
+import functools
+import re
 import urllib.parse
 from typing import Any, Dict, Optional, Sequence, Tuple
 
@@ -8,6 +10,13 @@ from mcp.types import TextContent, Tool
 from ..service import TextEditorService
 from .base import BaseHandler
 
+# text://{host}{path}?lines={start}-{end} with plain digits and nothing that
+# urlparse would strip, split off or reject; other URIs go through urlparse
+_LINE_RANGE_URI = re.compile(
+    r"text://[\w.~:@-]*(?P<path>/[^?#;\s]*)?\?lines=(?P<start>[0-9]*)-(?P<end>[0-9]*)",
+    re.ASCII,
+)
+
 
 class LineRangeResourceHandler(BaseHandler):
     """Handler for accessing text file contents through URI templates."""
@@ -78,9 +87,14 @@ class LineRangeResourceHandler(BaseHandler):
             },
         )
 
-    def _parse_uri(self, uri: str) -> Tuple[str, int, Optional[int]]:
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_uri(uri: str) -> Tuple[str, int, Optional[int]]:
         """Parse the resource URI to extract file path and line range.
 
+        Results are cached by URI, as the same ranges tend to be requested
+        repeatedly; invalid URIs raise and so are never cached.
+
         Args:
             uri: URI in format text://{file_path}?lines={line_start}-{line_end}
 
@@ -91,25 +105,32 @@ class LineRangeResourceHandler(BaseHandler):
             ValueError: If the URI format is invalid.
         """
         try:
-            parsed = urllib.parse.urlparse(uri)
-            if parsed.scheme != "text":
-                raise ValueError(f"Invalid URI scheme: {parsed.scheme}")
-
-            # Extract file path (remove leading / if present)
-            file_path = parsed.path.lstrip("/")
-
-            # Parse query parameters
-            query = urllib.parse.parse_qs(parsed.query)
-            if "lines" not in query:
-                raise ValueError("Missing 'lines' parameter")
-
-            # Parse line range (format: start-end or start-)
-            line_range = query["lines"][0]
-            if "-" not in line_range:
-                raise ValueError("Invalid line range format")
-
-            start_str, *end_parts = line_range.split("-")
-            end_str = end_parts[0] if end_parts else None
+            match = _LINE_RANGE_URI.fullmatch(uri)
+            if match is not None:
+                # The form the resource template lists, parsed as urlparse
+                # would: the host part is dropped from the path
+                file_path = (match["path"] or "").lstrip("/")
+                start_str, end_str = match["start"], match["end"]
+            else:
+                parsed = urllib.parse.urlparse(uri)
+                if parsed.scheme != "text":
+                    raise ValueError(f"Invalid URI scheme: {parsed.scheme}")
+
+                # Extract file path (remove leading / if present)
+                file_path = parsed.path.lstrip("/")
+
+                # Parse query parameters
+                query = urllib.parse.parse_qs(parsed.query)
+                if "lines" not in query:
+                    raise ValueError("Missing 'lines' parameter")
+
+                # Parse line range (format: start-end or start-)
+                line_range = query["lines"][0]
+                if "-" not in line_range:
+                    raise ValueError("Invalid line range format")
+
+                start_str, *end_parts = line_range.split("-")
+                end_str = end_parts[0] if end_parts else None
 
             # Convert to integers
             line_start = int(start_str) if start_str else 1
@@ -1,17 +1,21 @@
 """Handler for peeking at the beginning of text files."""
 
-import json
+import asyncio
 import logging
 import os
+import stat
 import traceback
 from typing import Any, Dict, Sequence
 
 from mcp.types import TextContent, Tool
 
-from .base import BaseHandler
+from .base import BaseHandler, dump_result
 
 logger = logging.getLogger("mcp-text-editor")
 
+# Files peeked at once in worker threads, which bounds open file descriptors
+PEEK_CONCURRENCY = 16
+
 
 class PeekTextFileContentsHandler(BaseHandler):
     """Handler for peeking at the first few lines of text files."""
@@ -69,75 +73,78 @@ class PeekTextFileContentsHandler(BaseHandler):
                 if not os.path.isabs(file_path):
                     raise RuntimeError(f"File path must be absolute: {file_path}")
 
-            results = {}
-            for file_path in file_paths:
-                try:
-                    # Check if file exists
-                    if not os.path.exists(file_path):
-                        results[file_path] = {
-                            "result": "error",
-                            "reason": f"File does not exist: {file_path}",
-                        }
-                        continue
-
-                    if not os.path.isfile(file_path):
-                        results[file_path] = {
-                            "result": "error",
-                            "reason": f"Path is not a file: {file_path}",
-                        }
-                        continue
-
-                    # Read the first N lines
-                    with open(file_path, "r", encoding=encoding) as f:
-                        lines = []
-                        for i, line in enumerate(f):
-                            if i >= num_lines:
-                                break
-                            lines.append(line)
-
-                    # Get file stats
-                    file_stats = os.stat(file_path)
-                    total_size = file_stats.st_size
-
-                    # Count total lines in file (efficient way)
-                    total_lines = 0
-                    with open(file_path, "r", encoding=encoding) as f:
-                        for _ in f:
-                            total_lines += 1
-
-                    # Calculate content hash of the peeked portion
-                    peeked_content = "".join(lines)
-                    peek_hash = self.editor.calculate_hash(peeked_content)
-
-                    # Calculate full file hash
-                    with open(file_path, "r", encoding=encoding) as f:
-                        full_content = f.read()
-                        full_hash = self.editor.calculate_hash(full_content)
-
-                    results[file_path] = {
-                        "result": "ok",
-                        "filename": os.path.basename(file_path),
-                        "lines": lines,
-                        "num_lines_peeked": len(lines),
-                        "total_lines": total_lines,
-                        "size": total_size,
-                        "peek_hash": peek_hash,
-                        "file_hash": full_hash,
-                    }
-                except UnicodeDecodeError:
-                    results[file_path] = {
-                        "result": "error",
-                        "reason": f"Could not decode file with {encoding} encoding. Possibly a binary file.",
-                    }
-                except Exception as e:
-                    results[file_path] = {
-                        "result": "error",
-                        "reason": f"Error reading file: {str(e)}",
-                    }
-
-            return [TextContent(type="text", text=json.dumps(results, indent=2))]
+            semaphore = asyncio.Semaphore(PEEK_CONCURRENCY)
+
+            async def peek(file_path: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await asyncio.to_thread(
+                        self._peek_file, file_path, num_lines, encoding
+                    )
+
+            # Files are peeked concurrently in worker threads; a path listed
+            # more than once is peeked once
+            unique_paths = list(dict.fromkeys(file_paths))
+            results = dict(
+                zip(unique_paths, await asyncio.gather(*map(peek, unique_paths)))
+            )
+
+            return [TextContent(type="text", text=dump_result(results))]
 
         except Exception as e:
             logger.error(f"Error processing request: {str(e)}")
             logger.error(traceback.format_exc())
             raise RuntimeError(f"Error processing request: {str(e)}") from e
+
+    def _peek_file(
+        self, file_path: str, num_lines: int, encoding: str
+    ) -> Dict[str, Any]:
+        """Peek at one file; this blocks on file I/O."""
+        try:
+            # Check the file exists and is a regular file with one stat,
+            # reused for its size
+            try:
+                file_stats = os.stat(file_path)
+            except OSError:
+                return {
+                    "result": "error",
+                    "reason": f"File does not exist: {file_path}",
+                }
+
+            if not stat.S_ISREG(file_stats.st_mode):
+                return {
+                    "result": "error",
+                    "reason": f"Path is not a file: {file_path}",
+                }
+
+            # Read the first N lines, count all lines and hash the whole file
+            # in a single pass
+            lines, total_lines, full_hash = self.editor.peek_lines(
+                file_path, num_lines, encoding
+            )
+
+            total_size = file_stats.st_size
+
+            # Calculate content hash of the peeked portion
+            peeked_content = "".join(lines)
+            peek_hash = self.editor.calculate_hash(peeked_content)
+
+            return {
+                "result": "ok",
+                "filename": os.path.basename(file_path),
+                "lines": lines,
+                "num_lines_peeked": len(lines),
+                "total_lines": total_lines,
+                "size": total_size,
+                "peek_hash": peek_hash,
+                "file_hash": full_hash,
+            }
+        except UnicodeDecodeError:
+            return {
+                "result": "error",
+                "reason": f"Could not decode file with {encoding} encoding. Possibly a binary file.",
+            }
+        except Exception as e:
+            return {
+                "result": "error",
+                "reason": f"Error reading file: {str(e)}",
+            }
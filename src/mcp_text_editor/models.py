@@ -2,10 +2,20 @@
 
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field
 
 
-class GetTextFileContentsRequest(BaseModel):
+class _FrozenModel(BaseModel):
+    """Base for the request and result models, which are never modified.
+
+    Schemas are built on first use rather than at import, so starting the
+    server does not pay for models a session never touches.
+    """
+
+    model_config = ConfigDict(frozen=True, defer_build=True)
+
+
+class GetTextFileContentsRequest(_FrozenModel):
     """Request model for getting text file contents."""
 
     file_path: str = Field(..., description="Path to the text file")
@@ -13,7 +23,7 @@ class GetTextFileContentsRequest(BaseModel):
     end: Optional[int] = Field(None, description="Ending line number (inclusive)")
 
 
-class GetTextFileContentsResponse(BaseModel):
+class GetTextFileContentsResponse(_FrozenModel):
     """Response model for getting text file contents."""
 
     contents: str = Field(..., description="File contents")
@@ -22,7 +32,7 @@ class GetTextFileContentsResponse(BaseModel):
     hash: str = Field(..., description="Hash of the contents")
 
 
-class EditPatch(BaseModel):
+class EditPatch(_FrozenModel):
     """Model for a single edit patch operation."""
 
     start: int = Field(1, description="Starting line for edit")
@@ -33,13 +43,8 @@ class EditPatch(BaseModel):
         description="Hash of content being replaced. Empty string for insertions.",
     )
 
-    @model_validator(mode="after")
-    def validate_range_hash(self) -> "EditPatch":
-        """Validate that range hash is provided."""
-        return self
 
-
-class EditFileOperation(BaseModel):
+class EditFileOperation(_FrozenModel):
     """Model for individual file edit operation."""
 
     path: str = Field(..., description="Path to the file")
@@ -47,7 +52,7 @@ class EditFileOperation(BaseModel):
     patches: List[EditPatch] = Field(..., description="Edit operations to apply")
 
 
-class EditResult(BaseModel):
+class EditResult(_FrozenModel):
     """Model for edit operation result."""
 
     result: str = Field(..., description="Operation result (ok/error)")
@@ -56,11 +61,6 @@ class EditResult(BaseModel):
         None, description="Current content hash (None for missing files)"
     )
 
-    @model_validator(mode="after")
-    def validate_error_result(self) -> "EditResult":
-        """Validate error result."""
-        return self
-
     def to_dict(self) -> Dict:
         """Convert EditResult to a dictionary."""
         result = {"result": self.result}
@@ -71,7 +71,7 @@ class EditResult(BaseModel):
         return result
 
 
-class EditTextFileContentsRequest(BaseModel):
+class EditTextFileContentsRequest(_FrozenModel):
     """Request model for editing text file contents.
 
     Example:
@@ -95,7 +95,7 @@ class EditTextFileContentsRequest(BaseModel):
     files: List[EditFileOperation] = Field(..., description="List of file operations")
 
 
-class FileRange(BaseModel):
+class FileRange(_FrozenModel):
     """Represents a line range in a file."""
 
     start: int = Field(..., description="Starting line number (1-based)")
@@ -107,7 +107,7 @@ class FileRange(BaseModel):
     )
 
 
-class FileRanges(BaseModel):
+class FileRanges(_FrozenModel):
     """Represents a file and its line ranges."""
 
     file_path: str = Field(..., description="Path to the text file")
@@ -116,7 +116,7 @@ class FileRanges(BaseModel):
     )
 
 
-class InsertTextFileContentsRequest(BaseModel):
+class InsertTextFileContentsRequest(_FrozenModel):
     """Request model for inserting text into a file.
 
     Example:
@@ -148,14 +148,8 @@ class InsertTextFileContentsRequest(BaseModel):
     )
     contents: str = Field(..., description="Content to insert")
 
-    @model_validator(mode="after")
-    def validate_position(self) -> "InsertTextFileContentsRequest":
-        """Validate that either after or before is specified, but not both."""
-        return self
-
-
 
-class DeleteTextFileContentsRequest(BaseModel):
+class DeleteTextFileContentsRequest(_FrozenModel):
     """Request model for deleting text from a file.
     Example:
     {
@@ -179,7 +173,7 @@ class DeleteTextFileContentsRequest(BaseModel):
     )
 
 
-class PatchTextFileContentsRequest(BaseModel):
+class PatchTextFileContentsRequest(_FrozenModel):
     """Request model for patching text in a file.
     Example:
     {
@@ -204,7 +198,7 @@ class PatchTextFileContentsRequest(BaseModel):
     )
 
 
-class AppendTextFileFromPathRequest(BaseModel):
+class AppendTextFileFromPathRequest(_FrozenModel):
     """Request model for appending content from one file to another.
     Example:
     {
@@ -223,7 +217,7 @@ class AppendTextFileFromPathRequest(BaseModel):
     )
 
 
-class AppendTextFileFromPathBatchRequest(BaseModel):
+class AppendTextFileFromPathBatchRequest(_FrozenModel):
     """Request model for appending content from multiple files to another.
     Example:
     {
@@ -258,7 +252,7 @@ class AppendTextFileFromPathBatchRequest(BaseModel):
     )
 
 
-class ExploreDirectoryContentsRequest(BaseModel):
+class ExploreDirectoryContentsRequest(_FrozenModel):
     """Request model for exploring directory contents.
     Example:
     {
@@ -281,7 +275,7 @@ class ExploreDirectoryContentsRequest(BaseModel):
     )
 
 
-class PeekTextFileContentsRequest(BaseModel):
+class PeekTextFileContentsRequest(_FrozenModel):
     """Request model for peeking at text file contents.
     Example:
     {
@@ -48,6 +48,28 @@ line_range_handler = LineRangeResourceHandler()
 explore_directory_handler = ExploreDirectoryContentsHandler()
 peek_file_handler = PeekTextFileContentsHandler()
 
+# Tool name -> handler, so a call is dispatched with one lookup; listed in
+# the order tools are reported to clients
+tool_handlers = {
+    handler.name: handler
+    for handler in (
+        get_contents_handler,
+        patch_file_handler,
+        create_file_handler,
+        append_file_handler,
+        append_file_from_path_handler,
+        delete_contents_handler,
+        insert_file_handler,
+        explore_directory_handler,
+        peek_file_handler,
+    )
+}
+
+# Tool descriptions never change, so they are built once
+tool_descriptions = [
+    handler.get_tool_description() for handler in tool_handlers.values()
+]
+
 
 @app.read_resource()
 async def read_resource(uri: str) -> TextContent:
@@ -124,31 +146,16 @@ PROMPTS = {
         ],
     ),
 }
+prompt_list = list(PROMPTS.values())
 
-
-@app.list_prompts()
-async def list_prompts() -> List[Prompt]:
-    """List available prompts."""
-    return list(PROMPTS.values())
-
-
-@app.get_prompt()
-async def get_prompt(name: str, arguments: dict | None = None) -> GetPromptResult:
-    """Handle prompt requests."""
-    if name not in PROMPTS:
-        raise ValueError(f"Prompt not found: {name}")
-
-    if arguments is None:
-        arguments = {}
-
-    if name == "simple-edit":
-        return GetPromptResult(
-            messages=[
-                PromptMessage(
-                    role="user",
-                    content=TextContent(
-                        type="text",
-                        text="""I need help editing a text file using the MCP text editor tools.
+# The simple-edit prompt takes no arguments, so its result is built once
+SIMPLE_EDIT_RESULT = GetPromptResult(
+    messages=[
+        PromptMessage(
+            role="user",
+            content=TextContent(
+                type="text",
+                text="""I need help editing a text file using the MCP text editor tools.
 
 To use these tools effectively, follow these steps:
 
@@ -164,10 +171,45 @@ To use these tools effectively, follow these steps:
    - For peeking at file contents: "peek_text_file_contents"
 
 Please help me edit a file of my choice.""",
-                    ),
-                )
-            ]
+            ),
         )
+    ]
+)
+
+# Fixed assistant replies that open the argument-based prompts
+CODE_IMPLEMENT_REPLY = PromptMessage(
+    role="assistant",
+    content=TextContent(
+        type="text",
+        text="I'll help you implement this code. Let me break this down into steps.",
+    ),
+)
+FIX_BUG_REPLY = PromptMessage(
+    role="assistant",
+    content=TextContent(
+        type="text",
+        text="I'll help you fix this bug. Let me start by examining the code to understand what's happening.",
+    ),
+)
+
+
+@app.list_prompts()
+async def list_prompts() -> List[Prompt]:
+    """List available prompts."""
+    return prompt_list
+
+
+@app.get_prompt()
+async def get_prompt(name: str, arguments: dict | None = None) -> GetPromptResult:
+    """Handle prompt requests."""
+    if name not in PROMPTS:
+        raise ValueError(f"Prompt not found: {name}")
+
+    if arguments is None:
+        arguments = {}
+
+    if name == "simple-edit":
+        return SIMPLE_EDIT_RESULT
 
     elif name == "code-implement":
         task = arguments.get("task", "[TASK]")
@@ -205,13 +247,7 @@ Please help me with this implementation. Follow these steps:
 Remember that all file paths must be absolute, and when patching files, you need the file hash and range hash for concurrency control.""",
                     ),
                 ),
-                PromptMessage(
-                    role="assistant",
-                    content=TextContent(
-                        type="text",
-                        text="I'll help you implement this code. Let me break this down into steps.",
-                    ),
-                ),
+                CODE_IMPLEMENT_REPLY,
             ]
         )
 
@@ -250,13 +286,7 @@ Please help me diagnose and fix this issue. Follow these steps:
 Remember that file paths must be absolute, and when using patch_text_file_contents, you need the file hash and range hash for each section you're modifying.""",
                     ),
                 ),
-                PromptMessage(
-                    role="assistant",
-                    content=TextContent(
-                        type="text",
-                        text="I'll help you fix this bug. Let me start by examining the code to understand what's happening.",
-                    ),
-                ),
+                FIX_BUG_REPLY,
             ]
         )
 
@@ -266,17 +296,7 @@ Remember that file paths must be absolute, and when using patch_text_file_conten
 @app.list_tools()
 async def list_tools() -> List[Tool]:
     """List available tools with enhanced descriptions and LLM guidance."""
-    return [
-        get_contents_handler.get_tool_description(),
-        patch_file_handler.get_tool_description(),
-        create_file_handler.get_tool_description(),
-        append_file_handler.get_tool_description(),
-        append_file_from_path_handler.get_tool_description(),
-        delete_contents_handler.get_tool_description(),
-        insert_file_handler.get_tool_description(),
-        explore_directory_handler.get_tool_description(),
-        peek_file_handler.get_tool_description(),
-    ]
+    return tool_descriptions
 
 
 @app.call_tool()
@@ -284,26 +304,10 @@ async def call_tool(name: str, arguments: Any) -> Sequence[TextContent]:
     """Handle tool calls."""
     logger.info(f"Calling tool: {name}")
     try:
-        if name == get_contents_handler.name:
-            return await get_contents_handler.run_tool(arguments)
-        elif name == create_file_handler.name:
-            return await create_file_handler.run_tool(arguments)
-        elif name == append_file_handler.name:
-            return await append_file_handler.run_tool(arguments)
-        elif name == append_file_from_path_handler.name:
-            return await append_file_from_path_handler.run_tool(arguments)
-        elif name == delete_contents_handler.name:
-            return await delete_contents_handler.run_tool(arguments)
-        elif name == insert_file_handler.name:
-            return await insert_file_handler.run_tool(arguments)
-        elif name == patch_file_handler.name:
-            return await patch_file_handler.run_tool(arguments)
-        elif name == explore_directory_handler.name:
-            return await explore_directory_handler.run_tool(arguments)
-        elif name == peek_file_handler.name:
-            return await peek_file_handler.run_tool(arguments)
-        else:
+        handler = tool_handlers.get(name)
+        if handler is None:
             raise ValueError(f"Unknown tool: {name}")
+        return await handler.run_tool(arguments)
     except ValueError:
         logger.error(traceback.format_exc())
         raise
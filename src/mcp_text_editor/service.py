@@ -22,9 +22,11 @@ class TextEditorService:
     """Service class for text file operations."""
 
     @staticmethod
-    def calculate_hash(content: str) -> str:
+    def calculate_hash(content: str | bytes) -> str:
         """Calculate SHA-256 hash of content."""
-        return hashlib.sha256(content.encode()).hexdigest()
+        if isinstance(content, str):
+            content = content.encode()
+        return hashlib.sha256(content, usedforsecurity=False).hexdigest()
 
     @staticmethod
     def read_file_contents(
@@ -221,6 +221,35 @@ async def test_delete_with_overlapping_ranges(editor, test_file):
     assert test_file.read_text() == "Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n"
 
 
+@pytest.mark.asyncio
+async def test_delete_overlapping_ranges_deletes_nothing(editor, test_file):
+    """Test overlapping ranges are rejected before any line is deleted."""
+    content, _, _, file_hash, _, _ = await editor.read_file_contents(str(test_file))
+    lines = content.splitlines(keepends=True)
+
+    request = DeleteTextFileContentsRequest(
+        file_path=str(test_file),
+        file_hash=file_hash,
+        ranges=[
+            FileRange(
+                start=4, end=5, range_hash=editor.calculate_hash("".join(lines[3:5]))
+            ),
+            FileRange(
+                start=1, end=2, range_hash=editor.calculate_hash("".join(lines[0:2]))
+            ),
+            FileRange(
+                start=2, end=3, range_hash=editor.calculate_hash("".join(lines[1:3]))
+            ),
+        ],
+    )
+
+    result = await editor.delete_text_file_contents(request)
+
+    assert result["result"] == "error"
+    assert result["reason"] == "Overlapping ranges: 1-2 and 2-3"
+    assert test_file.read_text() == "Line 1\nLine 2\nLine 3\nLine 4\nLine 5\n"
+
+
 @pytest.mark.asyncio
 async def test_delete_multiple_ranges(editor, test_file):
     """Test deleting multiple non-consecutive ranges."""
@@ -252,3 +281,49 @@ async def test_delete_multiple_ranges(editor, test_file):
 
     assert result[str(test_file)]["result"] == "ok"
     assert test_file.read_text() == "Line 1\nLine 3\nLine 5\n"
+
+
+@pytest.mark.asyncio
+async def test_delete_unordered_ranges(editor, test_file):
+    """Test deleting several ranges given out of file order."""
+    content, _, _, file_hash, _, _ = await editor.read_file_contents(str(test_file))
+
+    request = DeleteTextFileContentsRequest(
+        file_path=str(test_file),
+        file_hash=file_hash,
+        ranges=[
+            FileRange(start=5, end=None, range_hash=editor.calculate_hash("Line 5\n")),
+            FileRange(
+                start=1, end=2, range_hash=editor.calculate_hash("Line 1\nLine 2\n")
+            ),
+            FileRange(start=4, end=4, range_hash=editor.calculate_hash("Line 4\n")),
+        ],
+    )
+
+    result = await editor.delete_text_file_contents(request)
+
+    assert result["result"] == "ok"
+    assert test_file.read_text() == "Line 3\n"
+    assert result["hash"] == editor.calculate_hash("Line 3\n")
+
+
+@pytest.mark.asyncio
+async def test_delete_ranges_without_range_hash(editor, test_file):
+    """Test deleting adjacent and trailing ranges that carry no range hash."""
+    _, _, _, file_hash, _, _ = await editor.read_file_contents(str(test_file))
+
+    request = DeleteTextFileContentsRequest(
+        file_path=str(test_file),
+        file_hash=file_hash,
+        ranges=[
+            FileRange(start=2, end=2),
+            FileRange(start=3, end=3),
+            FileRange(start=5, end=None),
+        ],
+    )
+
+    result = await editor.delete_text_file_contents(request)
+
+    assert result["result"] == "ok"
+    assert test_file.read_text() == "Line 1\nLine 4\n"
+    assert result["hash"] == editor.calculate_hash("Line 1\nLine 4\n")
@@ -155,3 +155,68 @@ async def test_file_path_error(explore_handler, temp_dir_with_files):
 
     with pytest.raises(RuntimeError, match="Path is not a directory"):
         await explore_handler.run_tool(args)
+
+
+@pytest.mark.asyncio
+async def test_explore_directory_file_hashes(explore_handler, tmpdir):
+    """Test file hashes match the text content and undecodable files are flagged."""
+    tmpdir.join("text.txt").write_binary("line1\r\nline2\n".encode("utf-8"))
+    tmpdir.join("invalid.txt").write_binary(b"valid\n\xff\xfe invalid\n")
+
+    result = await explore_handler.run_tool({"directory_path": str(tmpdir)})
+    items = {item["name"]: item for item in json.loads(result[0].text)["contents"]}
+
+    editor = explore_handler.editor
+    assert items["text.txt"]["hash"] == editor.calculate_hash("line1\nline2\n")
+    assert items["invalid.txt"]["hash"] is None
+    assert "hash_error" in items["invalid.txt"]
+
+
+@pytest.mark.asyncio
+async def test_explore_directory_without_sizes(explore_handler, temp_dir_with_files):
+    """Test exploring a directory without looking up file sizes."""
+    args = {
+        "directory_path": str(temp_dir_with_files),
+        "include_file_hashes": False,
+        "include_sizes": False,
+    }
+
+    result = await explore_handler.run_tool(args)
+    data = json.loads(result[0].text)
+
+    files = [item for item in data["contents"] if not item["is_directory"]]
+    assert files
+    assert all(item["size"] is None for item in files)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include_sizes", [True, False])
+async def test_explore_directory_max_hash_size(explore_handler, tmpdir, include_sizes):
+    """Test files above max_hash_size are listed without being hashed."""
+    tmpdir.join("small.txt").write("12345")
+    tmpdir.join("large.txt").write("1234567890")
+
+    args = {
+        "directory_path": str(tmpdir),
+        "include_sizes": include_sizes,
+        "max_hash_size": 5,
+    }
+    result = await explore_handler.run_tool(args)
+    items = {item["name"]: item for item in json.loads(result[0].text)["contents"]}
+
+    assert items["small.txt"]["hash"] == explore_handler.editor.calculate_hash("12345")
+    assert items["large.txt"]["hash"] is None
+    assert "hash_skipped_reason" in items["large.txt"]
+
+
+@pytest.mark.asyncio
+async def test_explore_directory_unknown_encoding(explore_handler, tmpdir):
+    """Test an unknown encoding is reported on each file rather than failing."""
+    tmpdir.join("text.txt").write("line1\n")
+
+    args = {"directory_path": str(tmpdir), "encoding": "no-such-encoding"}
+    result = await explore_handler.run_tool(args)
+    items = {item["name"]: item for item in json.loads(result[0].text)["contents"]}
+
+    assert items["text.txt"]["hash"] is None
+    assert "hash_error" in items["text.txt"]
@@ -1,7 +1,17 @@
 """Tests for the base TextEditor class functionality."""
 
+import builtins
+import os
+import time
+
 import pytest
 
+from mcp_text_editor.base_operations import (
+    EncodedLines,
+    _is_utf8,
+    count_text_lines,
+    split_lines,
+)
 from mcp_text_editor.models import EditPatch
 from mcp_text_editor.text_editor import TextEditor 
 
@@ -21,6 +31,288 @@ async def test_calculate_hash(editor):
     assert hash1 == hash2
     assert isinstance(hash1, str)
     assert len(hash1) == 64  # SHA-256 hash length
+    assert editor.calculate_hash(content.encode()) == hash1
+
+
+@pytest.mark.parametrize(
+    "data,encoding",
+    [
+        (b"Line 1\nLine 2\n", "utf-8"),
+        (b"Line 1\r\nLine 2\r\n", "utf-8"),
+        (b"\x83\x65\x83\x58\x83\x67\n", "shift_jis"),
+    ],
+)
+def test_hash_file_matches_text_hash(editor, tmp_path, data, encoding):
+    """Test hash_file agrees with hashing the file read in text mode."""
+    file_path = tmp_path / "hashed.txt"
+    file_path.write_bytes(data)
+
+    with open(file_path, "r", encoding=encoding) as f:
+        expected = editor.calculate_hash(f.read())
+
+    assert editor.hash_file(str(file_path), encoding=encoding) == expected
+
+
+@pytest.mark.parametrize("chunk_size", [2, 3, 5, 1 << 18])
+@pytest.mark.parametrize("num_lines", [0, 1, 3, 10])
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"a\nbb\r\nccc\rdddd\ne", b"one\ntwo\n", b"single line without end"],
+)
+def test_peek_lines_matches_text_iteration(
+    editor, tmp_path, monkeypatch, chunk_size, num_lines, data
+):
+    """Test peek_lines agrees with iterating and reading the file in text mode."""
+    from mcp_text_editor import base_operations
+
+    monkeypatch.setattr(base_operations, "HASH_CHUNK_SIZE", chunk_size)
+    file_path = tmp_path / "peeked.txt"
+    file_path.write_bytes(data)
+
+    with open(file_path, "r") as f:
+        all_lines = list(f)
+
+    lines, total_lines, file_hash = editor.peek_lines(str(file_path), num_lines)
+
+    assert lines == all_lines[:num_lines]
+    assert total_lines == len(all_lines)
+    assert file_hash == editor.calculate_hash("".join(all_lines))
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        ("a\nb\n", ["a\n", "b\n"]),
+        ("a\nb", ["a\n", "b"]),
+        ("", []),
+        ("page\fbreak\n", ["page\fbreak\n"]),
+        ("sep\u2028arator\n", ["sep\u2028arator\n"]),
+    ],
+)
+def test_split_lines(text, expected):
+    """Test split_lines only breaks on newlines, like readlines()."""
+    assert split_lines(text) == expected
+    assert count_text_lines(text) == len(expected)
+
+
+@pytest.mark.parametrize(
+    "encoding,expected",
+    [
+        ("utf-8", True),
+        ("UTF8", True),
+        ("U8", True),
+        (None, True),
+        ("utf-8-sig", False),
+        ("shift_jis", False),
+        ("no-such-codec", False),
+    ],
+)
+def test_is_utf8(encoding, expected):
+    """Test recognising UTF-8 encoding names."""
+    assert _is_utf8(encoding) is expected
+
+
+@pytest.mark.parametrize(
+    "lines", [["a\n", "bb\n", "ccc"], ["テスト\n", "ascii\n", "ü\n"]]
+)
+@pytest.mark.parametrize("start,end", [(0, 3), (1, 2), (2, 2), (2, 1), (1, 10), (5, 7)])
+def test_encoded_lines_hash_range(editor, lines, start, end):
+    """Test range hashes over the encoded buffer match hashing joined lines."""
+    encoded = EncodedLines(lines)
+    expected = editor.calculate_hash("".join(lines[start:end]))
+    assert encoded.hash_range(start, end) == expected
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "shift_jis"])
+def test_atomic_write_text_hash(editor, tmp_path, encoding):
+    """Test the hash returned by an atomic write matches the file read back."""
+    file_path = tmp_path / "encoded.txt"
+
+    new_hash = editor._atomic_write_text(str(file_path), "テスト\nline\n", encoding)
+
+    assert new_hash == editor.hash_file(str(file_path), encoding=encoding)
+
+
+def test_atomic_write_text(editor, tmp_path):
+    """Test atomic writes replace content, keep permissions and leave no temp files."""
+    file_path = tmp_path / "atomic.txt"
+    file_path.write_text("old content\n")
+    file_path.chmod(0o640)
+
+    new_hash = editor._atomic_write_text(str(file_path), "new content\n", "utf-8")
+
+    assert file_path.read_text() == "new content\n"
+    assert new_hash == editor.calculate_hash("new content\n")
+    assert file_path.stat().st_mode & 0o777 == 0o640
+    assert [p.name for p in tmp_path.iterdir()] == ["atomic.txt"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [b"", b"one", b"one\n", b"one\ntwo", b"a\r\nb\rc\n", b"page\x0cbreak\n\n"],
+)
+def test_count_lines(editor, tmp_path, data):
+    """Test count_lines agrees with the number of lines readlines() returns."""
+    file_path = tmp_path / "count.txt"
+    file_path.write_bytes(data)
+
+    with open(file_path, "r", encoding="utf-8") as f:
+        expected = len(f.readlines())
+
+    assert editor.count_lines(str(file_path)) == expected
+
+
+def _set_mtime(file_path, mtime_ns):
+    os.utime(file_path, ns=(mtime_ns, mtime_ns))
+
+
+def test_read_text_lines_cache(editor, tmp_path, monkeypatch):
+    """Test unchanged files are served from the read cache."""
+    file_path = tmp_path / "cached.txt"
+    file_path.write_text("line1\nline2\n")
+    old_mtime = time.time_ns() - 60_000_000_000
+    _set_mtime(file_path, old_mtime)
+
+    data, lines, _ = editor._read_text_lines(str(file_path), "utf-8")
+    assert data == "line1\nline2\n"
+    lines.append("mutated\n")
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("cached file was read again")
+
+    with monkeypatch.context() as m:
+        m.setattr(builtins, "open", fail_open)
+        data, lines, _ = editor._read_text_lines(str(file_path), "utf-8")
+    assert lines == ["line1\n", "line2\n"]
+
+    # A rewrite changes the stat identity and is picked up
+    file_path.write_text("changed\n")
+    _set_mtime(file_path, old_mtime + 1_000_000_000)
+    data, lines, _ = editor._read_text_lines(str(file_path), "utf-8")
+    assert data == "changed\n"
+
+
+@pytest.mark.parametrize("content", [b"one\ntwo\n", b"one\r\ntwo\r"])
+def test_file_hasher_uses_read_cache(editor, tmp_path, monkeypatch, content):
+    """Test cached files are hashed once and not read again to hash them."""
+    file_path = tmp_path / "cached.txt"
+    file_path.write_bytes(content)
+    _set_mtime(file_path, time.time_ns() - 60_000_000_000)
+    expected = editor.hash_file(str(file_path))
+    _, expected_resumable = editor._file_hasher(str(file_path))
+
+    data, _, encoded = editor._read_text_lines(str(file_path), "utf-8")
+    assert editor._text_hash(str(file_path), "utf-8", data, encoded) == expected
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("cached file was read again")
+
+    with monkeypatch.context() as m:
+        m.setattr(builtins, "open", fail_open)
+        hasher, resumable = editor._file_hasher(str(file_path))
+        hasher.update(b"appended")
+    assert resumable == expected_resumable
+    assert editor.hash_file(str(file_path)) == expected
+
+
+def test_hash_file_caches_validated_hashes(editor, tmp_path, monkeypatch):
+    """Test validated hashes of unchanged files are served without reading them."""
+    file_path = tmp_path / "hashed.txt"
+    file_path.write_bytes(b"one\ntwo\n")
+    old_mtime = time.time_ns() - 60_000_000_000
+    _set_mtime(file_path, old_mtime)
+    expected = editor.hash_file(str(file_path), validate=True)
+
+    def fail_open(*args, **kwargs):
+        raise AssertionError("unchanged file was hashed again")
+
+    with monkeypatch.context() as m:
+        m.setattr(builtins, "open", fail_open)
+        assert editor.hash_file(str(file_path)) == expected
+
+    file_path.write_bytes(b"one\nTWO\n")
+    _set_mtime(file_path, old_mtime + 1_000_000_000)
+    assert editor.hash_file(str(file_path), validate=True) == editor.calculate_hash(
+        "one\nTWO\n"
+    )
+
+
+def test_read_cache_byte_budget(editor, tmp_path, monkeypatch):
+    """Test the read cache skips large files and evicts to stay within budget."""
+    from mcp_text_editor import base_operations
+
+    monkeypatch.setattr(base_operations, "FILE_CACHE_MAX_FILE_SIZE", 8)
+    monkeypatch.setattr(base_operations, "FILE_CACHE_MAX_BYTES", 10)
+    old_mtime = time.time_ns() - 60_000_000_000
+    paths = []
+    for name, content in [("big", "123456789\n"), ("a", "one\n"), ("b", "two\n")]:
+        file_path = tmp_path / f"{name}.txt"
+        file_path.write_text(content)
+        _set_mtime(file_path, old_mtime)
+        editor._read_text_lines(str(file_path), "utf-8")
+        paths.append(str(file_path))
+
+    def cached(path):
+        return (os.path.abspath(path), "utf-8") in base_operations._file_cache
+
+    big, a, b = paths
+    assert not cached(big)
+    assert cached(a) and cached(b)
+
+    c = tmp_path / "c.txt"
+    c.write_text("three\n")
+    _set_mtime(c, old_mtime)
+    editor._read_text_lines(str(c), "utf-8")
+    assert not cached(a)
+    assert cached(b) and cached(str(c))
+
+
+@pytest.mark.asyncio
+async def test_whole_file_read_defers_splitting(editor, tmp_path):
+    """Test lines skipped by a whole-file read are split when later needed."""
+    file_path = tmp_path / "deferred.txt"
+    file_path.write_text("line1\nline2\nline3")
+    _set_mtime(file_path, time.time_ns() - 60_000_000_000)
+
+    content, _, end, _, total_lines, _ = await editor.read_file_contents(str(file_path))
+    assert content == "line1\nline2\nline3"
+    assert end == total_lines == 3
+
+    result = await editor.read_file_contents(str(file_path), return_lines=True)
+    assert result[-1] == ["line1\n", "line2\n", "line3"]
+
+
+def test_encoded_lines_reused_from_cache(editor, tmp_path):
+    """Test range-hash buffers of an unchanged cached file are built once."""
+    file_path = tmp_path / "encoded.txt"
+    file_path.write_text("line1\nline2\n")
+    _set_mtime(file_path, time.time_ns() - 60_000_000_000)
+
+    _, lines, _ = editor._read_text_lines(str(file_path), "utf-8")
+    encoded = editor._encoded_lines(str(file_path), "utf-8", lines)
+    assert editor._encoded_lines(str(file_path), "utf-8", lines) is encoded
+    assert encoded.hash_range(1, 2) == editor.calculate_hash("line2\n")
+
+    # Lines that differ from the cached file get their own encoding
+    lines[1] = "changed\n"
+    other = editor._encoded_lines(str(file_path), "utf-8", lines)
+    assert other is not encoded
+    assert other.hash_range(1, 2) == editor.calculate_hash("changed\n")
+
+
+def test_read_text_lines_skips_racy_files(editor, tmp_path):
+    """Test freshly modified files are not cached."""
+    file_path = tmp_path / "racy.txt"
+    file_path.write_text("aaaa\n")
+    mtime = file_path.stat().st_mtime_ns
+
+    editor._read_text_lines(str(file_path), "utf-8")
+
+    # Same size and mtime, as after a rewrite within one timestamp tick
+    file_path.write_text("bbbb\n")
+    _set_mtime(file_path, mtime)
+    data, _, _ = editor._read_text_lines(str(file_path), "utf-8")
+    assert data == "bbbb\n"
 
 
 @pytest.fixture
@@ -103,6 +395,45 @@ async def test_read_file_contents_with_start_beyond_total(editor, tmp_path):
     assert content_size == 0
 
 
+@pytest.mark.parametrize(
+    "data,encoding",
+    [
+        (b"Line 1\nLine 2\n", "utf-8"),
+        (b"Line 1\r\nLine 2\rLine 3", "utf-8"),
+        ("\u00fcber\n".encode("utf-8"), "utf-8"),
+        (b"\x83\x65\x83\x58\x83\x67\n", "shift_jis"),
+    ],
+)
+@pytest.mark.asyncio
+async def test_read_file_contents_matches_text_mode(editor, tmp_path, data, encoding):
+    """Test content, hash and size agree with reading the file in text mode."""
+    file_path = tmp_path / "text_mode.txt"
+    file_path.write_bytes(data)
+    with open(file_path, "r", encoding=encoding) as f:
+        expected = f.read()
+
+    content, _, _, content_hash, total_lines, size = await editor.read_file_contents(
+        str(file_path), encoding=encoding
+    )
+
+    assert content == expected
+    assert content_hash == editor.calculate_hash(expected)
+    assert size == len(expected.encode(encoding))
+    assert total_lines == len(expected.splitlines())
+
+
+@pytest.mark.asyncio
+async def test_read_file_contents_return_lines(editor, test_file):
+    """Test read_file_contents also returning the split lines."""
+    result = await editor.read_file_contents(str(test_file), return_lines=True)
+
+    assert len(result) == 7
+    content, _, _, _, total_lines, _, lines = result
+    assert lines == ["Line 1\n", "Line 2\n", "Line 3\n", "Line 4\n", "Line 5\n"]
+    assert total_lines == len(lines)
+    assert content == "".join(lines)
+
+
 @pytest.mark.asyncio
 async def test_read_multiple_ranges_line_exceed(editor, tmp_path):
     """Test reading multiple ranges with exceeding line numbers."""
@@ -216,3 +547,212 @@ async def test_empty_content_handling(editor, tmp_path):
     assert content == ""
     assert total_lines == 0
     assert size == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "original,encoding",
+    [
+        (b"one\ntwo", "utf-8"),
+        (b"one\r\ntwo\r\n", "utf-8"),
+        (b"one\rtwo\r", "utf-8"),
+        ("café\n".encode("latin-1"), "latin-1"),
+    ],
+)
+async def test_append_hash_matches_reread(editor, tmp_path, original, encoding):
+    """Test the hash after appending matches hashing the file again."""
+    target = tmp_path / "target.txt"
+    target.write_bytes(original)
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"\nthree\nfour")
+
+    result = await editor.append_text_file_from_path(
+        str(source), str(target), editor.hash_file(str(target), encoding), encoding
+    )
+    assert result["result"] == "ok"
+    assert result["hash"] == editor.hash_file(str(target), encoding)
+
+    result = await editor.append_text_file_from_path_batch(
+        [str(source)],
+        str(target),
+        result["hash"],
+        encoding,
+        structure_template="== {fileName}\r\n",
+    )
+    assert result["result"] == "ok"
+    assert result["hash"] == editor.hash_file(str(target), encoding)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("chunk_size", [2, 3, 5, 1 << 20])
+async def test_append_copies_text_mode_content(
+    editor, tmp_path, monkeypatch, chunk_size
+):
+    """Test appending copies what reading the source in text mode returns."""
+    from mcp_text_editor import file_operations
+
+    monkeypatch.setattr(file_operations, "COPY_CHUNK_SIZE", chunk_size)
+    target = tmp_path / "target.txt"
+    target.write_text("start\n")
+    source = tmp_path / "source.txt"
+    source.write_bytes("a\r\nb\r\r\nc\rd\r".encode())
+
+    result = await editor.append_text_file_from_path(
+        str(source), str(target), editor.hash_file(str(target))
+    )
+    assert result["result"] == "ok"
+    assert target.read_bytes() == b"start\n" + source.read_text().encode()
+    assert result["hash"] == editor.hash_file(str(target))
+
+
+@pytest.mark.asyncio
+async def test_append_invalid_source_encoding(editor, tmp_path):
+    """Test appending a source that is not valid in the encoding fails."""
+    target = tmp_path / "target.txt"
+    target.write_text("start\n")
+    source = tmp_path / "source.txt"
+    source.write_bytes(b"caf\xe9\n")
+
+    result = await editor.append_text_file_from_path(
+        str(source), str(target), editor.hash_file(str(target))
+    )
+    assert result["result"] == "error"
+
+
+@pytest.mark.asyncio
+async def test_append_batch_keeps_source_order(editor, tmp_path, monkeypatch):
+    """Test batch append writes prefetched and streamed sources in order."""
+    from mcp_text_editor import file_operations
+
+    monkeypatch.setattr(file_operations, "PREFETCH_MAX_SIZE", 8)
+    target = tmp_path / "target.txt"
+    target.write_text("start\n")
+    small = tmp_path / "small.txt"
+    small.write_text("small")
+    large = tmp_path / "large.txt"
+    large.write_text("large\nfile\n")
+    invalid = tmp_path / "invalid.txt"
+    invalid.write_bytes(b"caf\xe9\n")
+
+    paths = [str(large), str(tmp_path / "missing.txt"), str(invalid), str(small)]
+    result = await editor.append_text_file_from_path_batch(
+        paths, str(target), editor.hash_file(str(target)), use_structured_format=False
+    )
+    assert result["result"] == "ok"
+    assert target.read_text() == "start\nlarge\nfile\nsmall\n"
+    assert result["hash"] == editor.hash_file(str(target))
+    appended = result["files_appended"]
+    assert [info["path"] for info in appended] == [str(large), str(invalid), str(small)]
+    assert [info.get("lines_appended") for info in appended] == [2, None, 1]
+    assert "error" in appended[1]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "concurrency,max_bytes,expected", [(2, 1 << 20, 2), (8, 10, 1)]
+)
+async def test_append_batch_bounds_prefetch(
+    editor, tmp_path, monkeypatch, concurrency, max_bytes, expected
+):
+    """Test batch append reads ahead within the concurrency and byte limits."""
+    from mcp_text_editor import file_operations
+
+    monkeypatch.setattr(file_operations, "PREFETCH_CONCURRENCY", concurrency)
+    monkeypatch.setattr(file_operations, "PREFETCH_MAX_BYTES", max_bytes)
+    target = tmp_path / "target.txt"
+    target.write_text("start\n")
+    paths = []
+    for i in range(6):
+        source = tmp_path / f"source{i}.txt"
+        source.write_text(f"line{i}\n")
+        paths.append(str(source))
+
+    read_text_lines = editor._read_text_lines
+    active = []
+    peak = []
+
+    def tracked_read(*args):
+        active.append(None)
+        peak.append(len(active))
+        time.sleep(0.01)
+        active.pop()
+        return read_text_lines(*args)
+
+    monkeypatch.setattr(editor, "_read_text_lines", tracked_read)
+    result = await editor.append_text_file_from_path_batch(
+        paths, str(target), editor.hash_file(str(target)), use_structured_format=False
+    )
+    assert result["result"] == "ok"
+    assert target.read_text() == "start\n" + "".join(f"line{i}\n" for i in range(6))
+    assert max(peak) == expected
+
+
+@pytest.mark.asyncio
+async def test_read_multiple_ranges_hashes(editor, tmp_path):
+    """Test range hashes of whole-file and repeated ranges."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Line 1\nLine 2\nLine 3\n")
+
+    result = await editor.read_multiple_ranges(
+        [
+            {
+                "file_path": str(test_file),
+                "ranges": [
+                    {"start": 1, "end": None},
+                    {"start": 2, "end": 3},
+                    {"start": 2, "end": 3},
+                ],
+            }
+        ]
+    )
+
+    file_result = result[str(test_file)]
+    whole, first, second = file_result["ranges"]
+    assert whole["range_hash"] == file_result["file_hash"]
+    assert first["range_hash"] == second["range_hash"]
+    assert first["range_hash"] == editor.calculate_hash("Line 2\nLine 3\n")
+
+
+def test_parse_header_template():
+    """Test header templates split into literals and plain fields only."""
+    from mcp_text_editor.file_operations import _parse_header_template
+
+    fields = {"fileName": "a.txt", "numberOfLinesInserted": 3}
+    template = "{{== {fileName} ({numberOfLinesInserted}) ==}}\n"
+    parts = _parse_header_template(template)
+    assert parts is not None
+    header = "".join(
+        literal + str(fields[name]) if name else literal for literal, name in parts
+    )
+    assert header == template.format(**fields)
+
+    assert _parse_header_template("{fileName!r}") is None
+    assert _parse_header_template("{numberOfLinesInserted:>5}") is None
+    assert _parse_header_template("{unknown}") is None
+    assert _parse_header_template("{fileName") is None
+
+
+@pytest.mark.asyncio
+async def test_read_multiple_ranges_repeated_file(editor, tmp_path, monkeypatch):
+    """Test a file listed twice is read once and keeps all its ranges."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Line 1\nLine 2\nLine 3\n")
+
+    reads = []
+    read_file_data = editor._read_file_data
+
+    def counting_read(file_path, *args, **kwargs):
+        reads.append(file_path)
+        return read_file_data(file_path, *args, **kwargs)
+
+    monkeypatch.setattr(editor, "_read_file_data", counting_read)
+    result = await editor.read_multiple_ranges(
+        [
+            {"file_path": str(test_file), "ranges": [{"start": 1, "end": 1}]},
+            {"file_path": str(test_file), "ranges": [{"start": 3, "end": None}]},
+        ]
+    )
+
+    assert reads == [str(test_file)]
+    contents = [r["content"] for r in result[str(test_file)]["ranges"]]
+    assert contents == ["Line 1\n", "Line 3\n"]
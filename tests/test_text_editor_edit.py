@@ -1,7 +1,11 @@
 """Tests for the TextEditor edit operations."""
 
+import os
+import time
+
 import pytest
 
+from mcp_text_editor import base_operations
 from mcp_text_editor.models import EditPatch
 from mcp_text_editor.text_editor import TextEditor
 
@@ -138,6 +142,175 @@ async def test_file_hash_mismatch(editor, tmp_path):
     assert test_file.read_text() == original_content  # File should remain unchanged
 
 
+@pytest.mark.asyncio
+async def test_range_hash_mismatch_applies_no_patches(editor, tmp_path):
+    """Test a range hash mismatch in any patch leaves the file untouched."""
+    test_file = tmp_path / "test_range_mismatch.txt"
+    original_content = "Line 1\nLine 2\nLine 3\n"
+    test_file.write_text(original_content)
+    file_hash = editor.calculate_hash(original_content)
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        file_hash,
+        [
+            {
+                "start": 3,
+                "end": 3,
+                "contents": "Updated Line 3\n",
+                "range_hash": "invalid_hash",
+            },
+            {
+                "start": 1,
+                "end": 1,
+                "contents": "Updated Line 1\n",
+                "range_hash": editor.calculate_hash("Line 1\n"),
+            },
+        ],
+    )
+
+    assert result[str(test_file)]["result"] == "error"
+    assert "Range hash mismatch for range 3-3" in result[str(test_file)]["reason"]
+    assert test_file.read_text() == original_content
+
+
+@pytest.mark.asyncio
+async def test_patches_use_original_line_numbers(editor, tmp_path):
+    """Test patches growing the file do not shift later patch ranges."""
+    test_file = tmp_path / "test_line_numbers.txt"
+    test_file.write_text("Line 1\nLine 2\nLine 3\n")
+    file_hash = editor.calculate_hash("Line 1\nLine 2\nLine 3\n")
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        file_hash,
+        [
+            {
+                "start": 1,
+                "end": 1,
+                "contents": "New 1a\nNew 1b\n",
+                "range_hash": editor.calculate_hash("Line 1\n"),
+            },
+            {
+                "start": 3,
+                "end": 3,
+                "contents": "New 3\n",
+                "range_hash": editor.calculate_hash("Line 3\n"),
+            },
+        ],
+    )
+
+    assert result[str(test_file)]["result"] == "ok"
+    assert test_file.read_text() == "New 1a\nNew 1b\nLine 2\nNew 3\n"
+
+
+@pytest.mark.asyncio
+async def test_edit_copies_unchanged_prefix(editor, tmp_path, monkeypatch):
+    """Test an edit below an unchanged prefix copied from the old file."""
+    monkeypatch.setattr(base_operations, "PREFIX_COPY_MIN_SIZE", 1)
+    test_file = tmp_path / "test_prefix.txt"
+    original_content = "".join(f"Line {i} \u00e9\n" for i in range(1, 101))
+    test_file.write_text(original_content, encoding="utf-8")
+    mtime_ns = time.time_ns() - 60_000_000_000
+    os.utime(test_file, ns=(mtime_ns, mtime_ns))
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        editor.calculate_hash(original_content),
+        [
+            {
+                "start": 99,
+                "end": 100,
+                "contents": "New tail\n",
+                "range_hash": editor.calculate_hash(
+                    "Line 99 \u00e9\nLine 100 \u00e9\n"
+                ),
+            }
+        ],
+    )
+
+    expected = "".join(f"Line {i} \u00e9\n" for i in range(1, 99)) + "New tail\n"
+    assert result[str(test_file)]["result"] == "ok"
+    assert test_file.read_text(encoding="utf-8") == expected
+    assert result[str(test_file)]["hash"] == editor.calculate_hash(expected)
+
+
+@pytest.mark.asyncio
+async def test_overlapping_patches_are_rejected(editor, tmp_path):
+    """Test overlapping patches are reported without modifying the file."""
+    test_file = tmp_path / "test_overlap_rejected.txt"
+    original_content = "Line 1\nLine 2\nLine 3\nLine 4\n"
+    test_file.write_text(original_content)
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        editor.calculate_hash(original_content),
+        [
+            {
+                "start": 2,
+                "end": 3,
+                "contents": "New Line 2-3\n",
+                "range_hash": editor.calculate_hash("Line 2\nLine 3\n"),
+            },
+            {
+                "start": 1,
+                "end": 2,
+                "contents": "New Line 1-2\n",
+                "range_hash": editor.calculate_hash("Line 1\nLine 2\n"),
+            },
+        ],
+    )
+
+    assert result[str(test_file)]["result"] == "error"
+    assert result[str(test_file)]["reason"] == "Overlapping patches: 1-2 and 2-3"
+    assert test_file.read_text() == original_content
+
+
+@pytest.mark.asyncio
+async def test_insert_and_replace_patches(editor, tmp_path):
+    """Test an empty-range insertion next to a replacement at the same line."""
+    test_file = tmp_path / "test_insert_replace.txt"
+    original_content = "Line 1\nLine 2\nLine 3\n"
+    test_file.write_text(original_content)
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        editor.calculate_hash(original_content),
+        [
+            {
+                "start": 2,
+                "end": 2,
+                "contents": "New Line 2\n",
+                "range_hash": editor.calculate_hash("Line 2\n"),
+            },
+            {"start": 2, "end": 1, "contents": "Inserted\n", "range_hash": ""},
+        ],
+    )
+
+    assert result[str(test_file)]["result"] == "ok"
+    assert test_file.read_text() == "Line 1\nInserted\nNew Line 2\nLine 3\n"
+
+
+@pytest.mark.asyncio
+async def test_insert_and_replace_to_end_patches(editor, tmp_path):
+    """Test an insertion next to a replacement with an open end at the same line."""
+    test_file = tmp_path / "test_insert_replace_to_end.txt"
+    original_content = "L1\nL2\nL3\n"
+    test_file.write_text(original_content)
+
+    result = await editor.edit_file_contents(
+        str(test_file),
+        editor.calculate_hash(original_content),
+        [
+            {"start": 2, "end": None, "contents": "NEW\n", "range_hash": ""},
+            {"start": 2, "end": 1, "contents": "INS\n", "range_hash": ""},
+        ],
+    )
+
+    assert result[str(test_file)]["result"] == "ok"
+    assert test_file.read_text() == "L1\nINS\nNEW\n"
+
+
 @pytest.mark.asyncio
 async def test_overlapping_patches(editor, tmp_path):
     """Test handling of overlapping patches."""